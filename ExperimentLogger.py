@@ -1,34 +1,89 @@
-import csv
 import json
 from pathlib import Path
 from datetime import datetime
+from logging_utils import BufferedCsvWriter
+from step_store import BinaryStepLogger
 
 class ExperimentLogger:
-    def __init__(self, experiment_name):
-        self.dir = Path("experiments") / experiment_name
+    def __init__(self, experiment_name, flush_every=100, flush_interval=5.0, fsync=False, binary=False,
+                 base_dir="experiments", resume=False):
+        """
+        Writes one row per step to <base_dir>/<experiment_name>/steps.csv
+        (base_dir defaults to experiments/).
+
+        The file stays open and rows are buffered; they are flushed every
+        `flush_every` rows or `flush_interval` seconds, and fsync'ed on each
+        flush if `fsync` is set. close() (or leaving a `with` block, or the
+        interpreter exiting) writes whatever is still buffered.
+
+        With `binary=True` every step is also written to the columnar
+        binary log in steps_bin/ (see step_store.py).
+
+        With `resume=True` an existing steps.csv is appended to instead of
+        replaced (see Experiment.resume).
+        """
+        if resume and binary:
+            raise ValueError("The binary log cannot be resumed; rebuild it from steps.csv with step_store.csv_to_binary")
+
+        self.dir = Path(base_dir) / experiment_name
         self.dir.mkdir(parents=True, exist_ok=True)
 
         self.csv_path = self.dir / "steps.csv"
+        if resume:
+            _drop_partial_row(self.csv_path)
 
-        with open(self.csv_path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
+        self.writer = BufferedCsvWriter(
+            self.csv_path,
+            [
                 "iteration",
                 "arm_index",
                 "arm_label",
                 "reward",
                 "q_values",
                 "timestamp"
-            ])
+            ],
+            mode="a" if resume else "w",
+            flush_every=flush_every,
+            flush_interval=flush_interval,
+            fsync=fsync,
+        )
+
+        self.binary = BinaryStepLogger(self.dir / "steps_bin") if binary else None
 
     def log_step(self, iteration, arm_index, arm_label, reward, q_values):
-        with open(self.csv_path, "a", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                iteration,
-                arm_index,
-                arm_label,
-                reward,
-                json.dumps(q_values.tolist()),  # <-- FIX
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            ])
+        self.writer.writerow([
+            iteration,
+            arm_index,
+            arm_label,
+            reward,
+            json.dumps(q_values.tolist()),  # <-- FIX
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ])
+        if self.binary is not None:
+            self.binary.log_step(iteration, arm_index, arm_label, reward, q_values)
+
+    def flush(self):
+        self.writer.flush()
+        if self.binary is not None:
+            self.binary.flush()
+
+    def close(self):
+        self.writer.close()
+        if self.binary is not None:
+            self.binary.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _drop_partial_row(path):
+    # a run killed in the middle of a write can leave half a row at the end
+    if not path.is_file():
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
@@ -1,16 +1,66 @@
+from collections import deque
+
 import numpy as np
 
 
-class EpsilonGreedy:
+class PendingPulls:
+    """
+    Bookkeeping for arms handed out before their reward arrives, so several
+    probes can be in flight at once (see Experiment.run_pipelined). Agents
+    call _init_pending in their constructor.
+    """
+
+    def _init_pending(self, n_arms):
+        # ticket -> arm
+        self.pending = {}
+        self.pending_counts = np.zeros(n_arms, dtype=int)
+        self._next_ticket = 0
+
+    def select_arm_pending(self):
+        """
+        Choose an arm whose reward will only arrive later. Returns
+        (ticket, arm); hand the ticket back to complete_pending together
+        with the reward, in any order.
+        """
+        arm = self.select_arm()
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self.pending[ticket] = arm
+        self.pending_counts[arm] += 1
+        return ticket, arm
+
+    def complete_pending(self, ticket, reward):
+        """Feed back the reward of a pending pull. Returns its arm."""
+        arm = self.pending.pop(ticket)
+        self.pending_counts[arm] -= 1
+        self.update(arm, reward)
+        return arm
+
+    def cancel_pending(self, ticket):
+        """Drop a pending pull whose reward will never come."""
+        arm = self.pending.pop(ticket)
+        self.pending_counts[arm] -= 1
+        return arm
+
+    def _counts_with_pending(self):
+        # in-flight pulls count as pulls already made, so a deterministic
+        # agent does not hand the same arm to every probe in the pipeline
+        return self.counts + self.pending_counts
+
+
+class EpsilonGreedy(PendingPulls):
 
     
-    def __init__(self, n_arms, epsilon, update_rule, alpha):
+    def __init__(self, n_arms, epsilon, update_rule, alpha, verbose=False):
         self.n_arms = n_arms 
         self.epsilon = epsilon
         self.update_rule = update_rule
         self.alpha = alpha
+        # print every update (debugging); off so headless runs stay lean
+        self.verbose = verbose
         self.counts = np.zeros(n_arms)   # Number of times each arm is pulled, basically how often each channel is used 
         self.values = np.full(n_arms, 500)
+        self._init_pending(n_arms)
         #self.values = np.zeros(n_arms) # Estimated values of each arm, basically estimated throughput per channel
         #np.random.seed()  # fixed seed
 
@@ -37,9 +87,10 @@ class EpsilonGreedy:
         self.counts[chosen_arm] += 1
         n = self.counts[chosen_arm]
         value = self.values[chosen_arm]
-        print(f"chosen_arm = {chosen_arm}")
-        print(f"n = {n}")
-        print(f"value = {value}")
+        if self.verbose:
+            print(f"chosen_arm = {chosen_arm}")
+            print(f"n = {n}")
+            print(f"value = {value}")
 
 
 
@@ -55,11 +106,182 @@ class EpsilonGreedy:
 
         elif self.update_rule == "exponential_smoothing":
             self.values[chosen_arm] = value + self.alpha *(reward-value)
-            something = self.values[chosen_arm]
-            print(f"value after update = {something}")
+            if self.verbose:
+                something = self.values[chosen_arm]
+                print(f"value after update = {something}")
  
 
         else:
             raise ValueError("update_rule must be 'incremental' or 'exponential_smoothing'")
 
 
+class UCB1(PendingPulls):
+
+    def __init__(self, n_arms, c=10.0):
+        """
+        Upper confidence bound: pull the arm with the highest
+        mean + c * sqrt(2 ln t / n). Exploration fades out as the estimates
+        tighten instead of costing a fixed share of the probes.
+
+        Args:
+            n_arms: Number of arms.
+            c: Scale of the exploration bonus in reward units, about the
+                spread of the rewards (throughputs span roughly 5-40 Mbps).
+        """
+        self.n_arms = n_arms
+        self.c = c
+        self.counts = np.zeros(n_arms)
+        self.sums = np.zeros(n_arms)
+        self.values = np.zeros(n_arms)
+        self._init_pending(n_arms)
+
+    def get_estimated_values(self):
+        return self.values
+
+    def select_arm(self):
+        counts = self._counts_with_pending()
+        # every arm once before any bound is defined
+        untried = np.flatnonzero(counts == 0)
+        if len(untried):
+            return untried[0]
+        t = counts.sum()
+        bounds = self.values + self.c * np.sqrt(2 * np.log(t) / counts)
+        return np.argmax(bounds)
+
+    def update(self, chosen_arm, reward):
+        self.counts[chosen_arm] += 1
+        self.sums[chosen_arm] += reward
+        self.values[chosen_arm] = self.sums[chosen_arm] / self.counts[chosen_arm]
+
+
+class GaussianThompson(PendingPulls):
+
+    def __init__(self, n_arms, prior_mean=22.5, prior_std=20.0, noise_std=5.0):
+        """
+        Thompson sampling with a Gaussian prior on each arm's mean throughput
+        and Gaussian measurement noise of known spread: pull the arm whose
+        sample from its posterior is highest.
+
+        Args:
+            n_arms: Number of arms.
+            prior_mean, prior_std: Belief about an arm's mean before it is measured.
+            noise_std: Spread of single measurements around an arm's mean.
+        """
+        self.n_arms = n_arms
+        self.noise_var = noise_std ** 2
+        self.counts = np.zeros(n_arms)
+        self.sums = np.zeros(n_arms)
+        self._prior_precision = 1.0 / prior_std ** 2
+        self._prior_weighted = prior_mean * self._prior_precision
+        self.values = np.full(n_arms, float(prior_mean))   # posterior means
+        self.stds = np.full(n_arms, float(prior_std))      # posterior stds
+        self._init_pending(n_arms)
+
+    def get_estimated_values(self):
+        return self.values
+
+    def select_arm(self):
+        return np.argmax(np.random.normal(self.values, self.stds))
+
+    def update(self, chosen_arm, reward):
+        self.counts[chosen_arm] += 1
+        self.sums[chosen_arm] += reward
+        precision = self._prior_precision + self.counts[chosen_arm] / self.noise_var
+        self.values[chosen_arm] = (self._prior_weighted + self.sums[chosen_arm] / self.noise_var) / precision
+        self.stds[chosen_arm] = np.sqrt(1.0 / precision)
+
+
+class DiscountedUCB(PendingPulls):
+
+    def __init__(self, n_arms, gamma=0.99, c=10.0):
+        """
+        UCB for non-stationary channels: counts and reward sums of all arms
+        decay by gamma every step, so old measurements fade (horizon of
+        about 1 / (1 - gamma) steps) and an arm that got better is found again.
+
+        Args:
+            n_arms: Number of arms.
+            gamma: Discount per step, closer to 1 = longer memory.
+            c: Scale of the exploration bonus in reward units.
+        """
+        self.n_arms = n_arms
+        self.gamma = gamma
+        self.c = c
+        self.counts = np.zeros(n_arms)   # discounted
+        self.sums = np.zeros(n_arms)     # discounted
+        self.values = np.zeros(n_arms)
+        self._init_pending(n_arms)
+
+    def get_estimated_values(self):
+        return self.values
+
+    def select_arm(self):
+        counts = self._counts_with_pending()
+        untried = np.flatnonzero(counts == 0)
+        if len(untried):
+            return untried[0]
+        t = counts.sum()
+        bounds = self.values + self.c * np.sqrt(2 * np.log(max(t, 1.0)) / counts)
+        return np.argmax(bounds)
+
+    def update(self, chosen_arm, reward):
+        self.counts *= self.gamma
+        self.sums *= self.gamma
+        self.counts[chosen_arm] += 1
+        self.sums[chosen_arm] += reward
+        self.values[chosen_arm] = self.sums[chosen_arm] / self.counts[chosen_arm]
+
+
+class SlidingWindowUCB(PendingPulls):
+
+    def __init__(self, n_arms, window=100, c=10.0):
+        """
+        UCB over the last `window` measurements only, for non-stationary
+        channels; an arm that drops out of the window is tried again.
+
+        Args:
+            n_arms: Number of arms.
+            window: Number of most recent (arm, reward) pairs kept.
+            c: Scale of the exploration bonus in reward units.
+        """
+        self.n_arms = n_arms
+        self.window = window
+        self.c = c
+        self.counts = np.zeros(n_arms)   # within the window
+        self.sums = np.zeros(n_arms)     # within the window
+        self.values = np.zeros(n_arms)
+        self._recent = deque()
+        self._init_pending(n_arms)
+
+    def get_estimated_values(self):
+        return self.values
+
+    def select_arm(self):
+        counts = self._counts_with_pending()
+        untried = np.flatnonzero(counts == 0)
+        if len(untried):
+            return untried[0]
+        t = min(len(self._recent), self.window) + self.pending_counts.sum()
+        bounds = self.values + self.c * np.sqrt(2 * np.log(max(t, 1)) / counts)
+        return np.argmax(bounds)
+
+    def update(self, chosen_arm, reward):
+        self._recent.append((chosen_arm, reward))
+        self.counts[chosen_arm] += 1
+        self.sums[chosen_arm] += reward
+        if len(self._recent) > self.window:
+            old_arm, old_reward = self._recent.popleft()
+            self.counts[old_arm] -= 1
+            self.sums[old_arm] -= old_reward
+            if self.counts[old_arm] > 0:
+                self.values[old_arm] = self.sums[old_arm] / self.counts[old_arm]
+        self.values[chosen_arm] = self.sums[chosen_arm] / self.counts[chosen_arm]
+
+
+AGENTS = {
+    "epsilon_greedy": EpsilonGreedy,
+    "ucb1": UCB1,
+    "thompson": GaussianThompson,
+    "discounted_ucb": DiscountedUCB,
+    "sliding_window_ucb": SlidingWindowUCB,
+}
@@ -0,0 +1,108 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from environments import WirelessChannelEnv, WirelessRouteEnv
+
+
+# Async front-end for the testbed environments. The probes still go through
+# the blocking environment (shared keep-alive session, retries, rate limiter),
+# but each one runs on a worker thread, so one event loop can keep several
+# source/destination pairs in flight against the same endpoint.
+#
+# Make the HTTP pool at least as large as the total concurrency, e.g.
+#   configure_http_session(pool_size=8)
+
+
+class AsyncEnv:
+
+    def __init__(self, env, max_concurrency=4, semaphore=None):
+        """
+        Wrap a WirelessChannelEnv/WirelessRouteEnv with an awaitable get_reward.
+
+        Args:
+            env: The blocking environment.
+            max_concurrency: Max probes of this environment in flight at once.
+            semaphore: Optional asyncio.Semaphore shared by several environments,
+                to bound the total concurrency against one endpoint instead.
+        """
+        self.env = env
+        self.max_concurrency = max_concurrency
+        self._semaphore = semaphore if semaphore is not None else asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="probe")
+
+    def __getattr__(self, name):
+        # channels, devices, source_ip, ... come from the wrapped environment
+        return getattr(self.env, name)
+
+    async def get_reward(self, arm_value):
+        """
+        Awaitable get_reward. Cancelling the awaiting task releases its slot
+        right away; an HTTP attempt already on the wire still runs to the end
+        (bounded by the env timeout) on its thread and its result is dropped.
+        """
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self.env.get_reward, arm_value)
+
+    def close(self):
+        # drop probes that have not started yet
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class AsyncWirelessChannelEnv(AsyncEnv):
+
+    def __init__(self, source_ip, dest_ip, channels, reward_endpoint, reward_machine, timeout=None,
+                 reward_trace=None, reward_cache=None, max_concurrency=4, semaphore=None):
+        super().__init__(
+            WirelessChannelEnv(source_ip, dest_ip, channels, reward_endpoint, reward_machine,
+                               timeout=timeout, reward_trace=reward_trace, reward_cache=reward_cache),
+            max_concurrency=max_concurrency,
+            semaphore=semaphore,
+        )
+
+
+class AsyncWirelessRouteEnv(AsyncEnv):
+
+    def __init__(self, source_ip, dest_ip, devices, reward_endpoint, reward_machine, channel, timeout=None,
+                 reward_trace=None, reward_cache=None, max_concurrency=4, semaphore=None):
+        super().__init__(
+            WirelessRouteEnv(source_ip, dest_ip, devices, reward_endpoint, reward_machine, channel,
+                             timeout=timeout, reward_trace=reward_trace, reward_cache=reward_cache),
+            max_concurrency=max_concurrency,
+            semaphore=semaphore,
+        )
+
+
+async def run_experiment_async(experiment, async_env, n_trials):
+    """
+    Headless Experiment loop (select -> await reward -> update -> log) against
+    an async environment. Several of these can run on one event loop.
+    """
+    labels = experiment._arm_labels()
+    for i in range(n_trials):
+        arm = experiment.agent.select_arm()
+        reward = await async_env.get_reward(labels[arm])
+        experiment.agent.update(arm, reward)
+        experiment.record_step(i, arm, labels[arm], reward)
+    experiment.logger.flush()
+    return experiment
+
+
+async def run_experiments_concurrently(pairs, n_trials):
+    """
+    Run several (experiment, async_env) pairs at once, e.g. one per
+    source/destination pair. If one fails the others are cancelled.
+    """
+    tasks = [asyncio.create_task(run_experiment_async(exp, env, n_trials)) for exp, env in pairs]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -0,0 +1,133 @@
+import numpy as np
+
+
+# Batch engine for the simulated reward machines (1, 2 and 4). Instead of one
+# EpsilonGreedy + Experiment per run, we hold the counts and Q-values of every
+# run as (n_runs, n_arms) arrays and advance all of them with one numpy call
+# per step.
+
+
+def draw_rewards(reward_machine, size, rng):
+    """
+    Vectorized version of the simulated branches of get_reward.
+    Returns an array of `size` rewards drawn from the given reward machine.
+    """
+    if reward_machine == 1:
+        return np.clip(rng.rayleigh(scale=5.0, size=size) + 5, 5, 40)
+
+    elif reward_machine == 2:
+        return np.clip(rng.normal(loc=22.5, scale=5, size=size), 5, 40)
+
+    elif reward_machine == 4:
+        return np.full(size, 10.0)
+
+    else:
+        raise ValueError("batch simulation supports reward_machine 1, 2 or 4")
+
+
+class BatchEpsilonGreedy:
+
+    def __init__(self, n_runs, n_arms, epsilon, update_rule, alpha, initial_value=500, seed=None):
+        """
+        Many independent EpsilonGreedy agents advanced together.
+
+        Args:
+            n_runs: Number of independent runs.
+            n_arms: Number of arms per run.
+            epsilon: Scalar or array of shape (n_runs,), one epsilon per run.
+            update_rule: 'incremental' or 'exponential_smoothing'.
+            alpha: Scalar or array of shape (n_runs,), one alpha per run.
+            initial_value: Starting Q-value for every arm (EpsilonGreedy starts at 500 too).
+            seed: Seed for the batch random generator.
+
+        Q-values are floats here. EpsilonGreedy keeps its values in an int
+        array (np.full(n_arms, 500)), so every one of its updates is
+        truncated to a whole number; batch results follow the exact update
+        rule and will not match Experiment runs step for step.
+        """
+        if update_rule not in ("incremental", "exponential_smoothing"):
+            raise ValueError("update_rule must be 'incremental' or 'exponential_smoothing'")
+
+        self.n_runs = n_runs
+        self.n_arms = n_arms
+        self.epsilon = np.broadcast_to(np.asarray(epsilon, dtype=float), (n_runs,))
+        self.update_rule = update_rule
+        self.alpha = np.broadcast_to(np.asarray(alpha, dtype=float), (n_runs,))
+        self.rng = np.random.default_rng(seed)
+
+        self.counts = np.zeros((n_runs, n_arms))
+        self.values = np.full((n_runs, n_arms), float(initial_value))
+        self._rows = np.arange(n_runs)
+
+    def get_estimated_values(self):
+        """
+        Returns the current Q-values of every run, shape (n_runs, n_arms).
+        """
+        return self.values
+
+    def select_arms(self):
+        """Choose one arm per run (explore or exploit)."""
+        explore = self.rng.random(self.n_runs) < self.epsilon
+        random_arms = self.rng.integers(self.n_arms, size=self.n_runs)
+        greedy_arms = np.argmax(self.values, axis=1)
+        return np.where(explore, random_arms, greedy_arms)
+
+    def update(self, chosen_arms, rewards):
+        """Update the chosen arm of every run with its reward."""
+        rows = self._rows
+        self.counts[rows, chosen_arms] += 1
+        value = self.values[rows, chosen_arms]
+
+        if self.update_rule == "incremental":
+            n = self.counts[rows, chosen_arms]
+            self.values[rows, chosen_arms] = value + (rewards - value) / n
+        else:
+            self.values[rows, chosen_arms] = value + self.alpha * (rewards - value)
+
+
+class BatchSimulation:
+
+    def __init__(self, agent, reward_machine):
+        """
+        Runs a BatchEpsilonGreedy against one of the simulated reward machines.
+        Rewards are drawn from the agent's generator so a seed fixes the whole study.
+        """
+        self.agent = agent
+        self.reward_machine = reward_machine
+
+    def run(self, n_steps, record_rewards=False):
+        """
+        Advance every run n_steps times.
+
+        Returns a dict with:
+            mean_reward_per_step: (n_steps,) reward averaged across runs
+            total_reward: (n_runs,) summed reward of each run
+            final_counts / final_values: (n_runs, n_arms) agent state
+            rewards: (n_steps, n_runs) float32 matrix, only if record_rewards
+        """
+        agent = self.agent
+        n_runs = agent.n_runs
+
+        mean_reward_per_step = np.empty(n_steps)
+        total_reward = np.zeros(n_runs)
+        rewards_matrix = np.empty((n_steps, n_runs), dtype=np.float32) if record_rewards else None
+
+        for step in range(n_steps):
+            arms = agent.select_arms()
+            rewards = draw_rewards(self.reward_machine, n_runs, agent.rng)
+            agent.update(arms, rewards)
+
+            total_reward += rewards
+            mean_reward_per_step[step] = rewards.mean()
+            if record_rewards:
+                rewards_matrix[step] = rewards
+
+        result = {
+            "mean_reward_per_step": mean_reward_per_step,
+            "total_reward": total_reward,
+            "final_counts": agent.counts.copy(),
+            "final_values": agent.values.copy(),
+        }
+        if record_rewards:
+            result["rewards"] = rewards_matrix
+        return result
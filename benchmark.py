@@ -0,0 +1,251 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+# Benchmarks for the Experiment step pipeline: each piece of the hot loop on
+# its own and the whole loop end to end, at several run lengths and arm
+# counts. Results are written as JSON so two commits can be compared:
+#
+#   python benchmark.py --output before.json
+#   ... change things ...
+#   python benchmark.py --output after.json --compare before.json
+
+
+def _stats(name, durations, **params):
+    durations = np.asarray(durations)
+    return {
+        "benchmark": name,
+        **params,
+        "calls": int(len(durations)),
+        "total_s": float(durations.sum()),
+        "mean_us": float(durations.mean() * 1e6),
+        "p50_us": float(np.percentile(durations, 50) * 1e6),
+        "p95_us": float(np.percentile(durations, 95) * 1e6),
+    }
+
+
+def _time_each(fn, args_list):
+    durations = np.empty(len(args_list))
+    for k, args in enumerate(args_list):
+        start = time.perf_counter()
+        fn(*args)
+        durations[k] = time.perf_counter() - start
+    return durations
+
+
+def _channel_env(n_arms, reward_machine, endpoint="http://localhost:8000/network/data-transfer-rate",
+                 reward_trace=None):
+    from environments import WirelessChannelEnv
+
+    return WirelessChannelEnv("192.168.2.80", "192.168.2.100", list(range(1, n_arms + 1)), endpoint, reward_machine,
+                              reward_trace=reward_trace)
+
+
+def _agent(n_arms):
+    from agents import EpsilonGreedy
+
+    return EpsilonGreedy(n_arms=n_arms, epsilon=0.25, update_rule="exponential_smoothing", alpha=0.5)
+
+
+def bench_agent(n_arms, n_steps):
+    agent = _agent(n_arms)
+    rng = np.random.default_rng(0)
+    rewards = rng.normal(22.5, 5, n_steps)
+
+    select = np.empty(n_steps)
+    update = np.empty(n_steps)
+    for k in range(n_steps):
+        start = time.perf_counter()
+        arm = agent.select_arm()
+        mid = time.perf_counter()
+        agent.update(arm, rewards[k])
+        select[k] = mid - start
+        update[k] = time.perf_counter() - mid
+
+    params = {"n_arms": n_arms, "n_steps": n_steps}
+    return [_stats("agent.select_arm", select, **params), _stats("agent.update", update, **params)]
+
+
+def bench_rewards(n_arms, n_steps, testbed_steps):
+    results = []
+    for machine in (1, 2, 4):
+        env = _channel_env(n_arms, machine)
+        durations = _time_each(env.get_reward, [(env.channels[k % n_arms],) for k in range(n_steps)])
+        results.append(_stats(f"env.get_reward[{machine}]", durations, n_arms=n_arms, n_steps=n_steps))
+
+    # reward_machine 3 against a synthetic memory-mapped trace
+    from traces import build_trace
+
+    rng = np.random.default_rng(0)
+    trace = build_trace(f"bench_trace_{n_arms}_{n_steps}.npy",
+                        {arm: rng.normal(22.5, 5, n_steps) for arm in range(1, n_arms + 1)})
+    env = _channel_env(n_arms, 3, reward_trace=trace)
+    durations = _time_each(env.get_reward, [(env.channels[k % n_arms],) for k in range(n_steps)])
+    results.append(_stats("env.get_reward[3]", durations, n_arms=n_arms, n_steps=n_steps))
+
+    if testbed_steps:
+        # reward_machine 0 against the local stand-in server, without pacing
+        import environments
+        from mock_testbed import MockTestbed
+
+        environments.configure_rate_limit(None)
+        with MockTestbed("ideal", seed=0) as testbed:
+            env = _channel_env(n_arms, 0, endpoint=testbed.url)
+            durations = _time_each(env.get_reward, [(env.channels[k % n_arms],) for k in range(testbed_steps)])
+        results.append(_stats("env.get_reward[0]", durations, n_arms=n_arms, n_steps=testbed_steps))
+    return results
+
+
+def bench_logger(n_arms, n_steps):
+    from ExperimentLogger import ExperimentLogger
+
+    logger = ExperimentLogger(f"bench_logger_{n_arms}_{n_steps}")
+    q_values = np.linspace(10, 30, n_arms)
+    durations = _time_each(logger.log_step, [(k, k % n_arms, k % n_arms + 1, 22.5, q_values) for k in range(n_steps)])
+    start = time.perf_counter()
+    logger.close()
+    close = time.perf_counter() - start
+    return [_stats("logger.log_step", np.append(durations, close), n_arms=n_arms, n_steps=n_steps)]
+
+
+def bench_live_plots(n_arms, n_steps):
+    import matplotlib
+    matplotlib.use("Agg")
+    from experiment import Experiment
+
+    exp = Experiment(_agent(n_arms), _channel_env(n_arms, 2), "optimal_channel")
+    methods = ["update_live_main_plot", "update_live_arm_plots", "update_live_arm_plots_for_each"]
+    durations = {name: np.empty(n_steps) for name in methods}
+
+    for i in range(n_steps):
+        arm = exp.agent.select_arm()
+        reward = exp.env.get_reward(exp.env.channels[arm])
+        exp.agent.update(arm, reward)
+        exp.record_step(i, arm, exp.env.channels[arm], reward)
+        for name in methods:
+            start = time.perf_counter()
+            getattr(exp, name)(i)
+            durations[name][i] = time.perf_counter() - start
+
+    import matplotlib.pyplot as plt
+    plt.close("all")
+    return [_stats(f"experiment.{name}", durations[name], n_arms=n_arms, n_steps=n_steps) for name in methods]
+
+
+def bench_end_to_end(n_arms, n_steps, reward_machine=2):
+    from experiment import Experiment
+
+    exp = Experiment(_agent(n_arms), _channel_env(n_arms, reward_machine), "optimal_channel")
+    start = time.perf_counter()
+    exp.run(n_steps)
+    total = time.perf_counter() - start
+    return [{
+        "benchmark": f"experiment.run[headless,{reward_machine}]",
+        "n_arms": n_arms,
+        "n_steps": n_steps,
+        "calls": n_steps,
+        "total_s": total,
+        "mean_us": total / n_steps * 1e6,
+    }]
+
+
+def _environment_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def run_suite(lengths, arm_counts, plot_lengths, testbed_steps):
+    results = []
+    for n_arms in arm_counts:
+        for n_steps in lengths:
+            print(f"n_arms={n_arms} n_steps={n_steps}", file=sys.stderr)
+            results += bench_agent(n_arms, n_steps)
+            results += bench_rewards(n_arms, n_steps, testbed_steps)
+            results += bench_logger(n_arms, n_steps)
+            results += bench_end_to_end(n_arms, n_steps)
+        for n_steps in plot_lengths:
+            print(f"n_arms={n_arms} live plots n_steps={n_steps}", file=sys.stderr)
+            results += bench_live_plots(n_arms, n_steps)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print mean per-call time against a baseline file; returns the regressions."""
+    key = lambda r: (r["benchmark"], r["n_arms"], r["n_steps"])
+    old = {key(r): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'benchmark':45s} {'arms':>5s} {'steps':>7s} {'old us':>10s} {'new us':>10s} {'ratio':>7s}")
+    for r in results:
+        before = old.get(key(r))
+        if before is None:
+            continue
+        ratio = r["mean_us"] / before["mean_us"] if before["mean_us"] else float("inf")
+        flag = "  <-- slower" if ratio > threshold else ""
+        print(f"{r['benchmark']:45s} {r['n_arms']:5d} {r['n_steps']:7d} "
+              f"{before['mean_us']:10.1f} {r['mean_us']:10.1f} {ratio:7.2f}{flag}")
+        if flag:
+            regressions.append(r)
+    return regressions
+
+
+def _int_list(text):
+    return [int(x) for x in text.split(",") if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Experiment step pipeline.")
+    parser.add_argument("--lengths", type=_int_list, default=[100, 1000, 10000], help="run lengths, e.g. 100,1000")
+    parser.add_argument("--arms", type=_int_list, default=[4, 16], help="arm counts, e.g. 4,16")
+    parser.add_argument("--plot-lengths", type=_int_list, default=[50, 200],
+                        help="run lengths for the live-plot benchmarks (empty to skip)")
+    parser.add_argument("--testbed-steps", type=int, default=200,
+                        help="probes against the local mock testbed (0 to skip)")
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio above which a benchmark counts as slower")
+    args = parser.parse_args()
+
+    # experiment directories and logs go to a throwaway working directory
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            results = run_suite(args.lengths, args.arms, args.plot_lengths, args.testbed_steps)
+        finally:
+            os.chdir(cwd)
+
+    report = {"environment": _environment_info(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
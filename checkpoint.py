@@ -0,0 +1,96 @@
+import csv
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+
+# Checkpoints of a running Experiment, written to <experiment dir>/checkpoint.pkl:
+# agent state, numpy's global RNG state, the experiment history, running
+# statistics and stopping rule and the replay position of a reward trace. The
+# file is written to a temporary name, fsync'ed and renamed over the old one,
+# so a run that dies mid-write still leaves the previous checkpoint intact.
+#
+# A resumed run is not bit-identical to an uninterrupted one: numpy's RNG is
+# put back to its state at the checkpoint, but the steps logged after it (which
+# are replayed from steps.csv) had already drawn from it, so those draws are
+# made a second time.
+
+CHECKPOINT_NAME = "checkpoint.pkl"
+
+_EXPERIMENT_STATE = (
+    "n_steps",
+    "total_reward",
+    "arm_counts",
+    "arm_reward_sums",
+    "arm_reward_sumsq",
+    "avg_reward_min",
+    "avg_reward_max",
+    "history_len",
+    "history",
+    "arm_history",
+    "_arm_history_step",
+    "stopping",
+    "identified_arm",
+    "identified_at",
+)
+
+
+def save_checkpoint(experiment, path):
+    state = {
+        "exptype": experiment.exptype,
+        "arm_labels": list(experiment._arm_labels()),
+        "experiment": {name: getattr(experiment, name) for name in _EXPERIMENT_STATE},
+        "agent": vars(experiment.agent),
+        "np_random": np.random.get_state(),
+        "trace_cursor": None,
+    }
+    trace = getattr(experiment.env, "reward_trace", None)
+    if trace is not None:
+        state["trace_cursor"] = trace.position
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def restore_checkpoint(experiment, state):
+    """Put a loaded checkpoint back into a freshly built Experiment (and its agent/env)."""
+    if state["exptype"] != experiment.exptype or state["arm_labels"] != list(experiment._arm_labels()):
+        raise ValueError("Checkpoint was written by an experiment with a different type or arm set")
+
+    for name, value in state["experiment"].items():
+        setattr(experiment, name, value)
+
+    agent = experiment.agent
+    vars(agent).update(state["agent"])
+    # probes that were in flight when the checkpoint was taken never came back
+    if getattr(agent, "pending", None):
+        for ticket in list(agent.pending):
+            agent.cancel_pending(ticket)
+
+    np.random.set_state(state["np_random"])
+
+    trace = getattr(experiment.env, "reward_trace", None)
+    if trace is not None and state["trace_cursor"] is not None:
+        trace.position = state["trace_cursor"]
+
+
+def logged_steps_after(csv_path, n_steps):
+    """(arm_index, reward) of the rows in steps.csv from iteration n_steps on."""
+    steps = []
+    with open(csv_path, newline="") as f:
+        for row in csv.DictReader(f):
+            if int(row["iteration"]) >= n_steps:
+                steps.append((int(row["arm_index"]), float(row["reward"])))
+    return steps
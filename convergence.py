@@ -0,0 +1,165 @@
+import argparse
+import json
+
+import numpy as np
+
+from agents import AGENTS
+
+
+# Probes-to-convergence of the agents in agents.py: how many measurements an
+# agent needs before its estimates settle on the best arm for good.
+#
+# The simulated reward machines 1 and 2 draw every arm from the same
+# distribution, so there is no best arm to find there. The scenarios below
+# keep their shapes (Rayleigh + offset, clipped normal) but give each arm its
+# own parameters; "switch" swaps the best and the worst arm halfway through
+# to show how the agents cope with a channel that changes.
+#
+#   python convergence.py --steps 1000 --seeds 20
+
+SCENARIOS = {
+    # machine 1 shape: clip(rayleigh(5) + offset, 5, 40)
+    "rayleigh": {"dist": "rayleigh", "params": [5, 6, 7, 9]},
+    # machine 2 shape: clip(normal(mean, 5), 5, 40)
+    "normal": {"dist": "normal", "params": [18, 22, 20, 28]},
+    "switch": {"dist": "normal", "params": [18, 22, 20, 28], "switch": [28, 22, 20, 18]},
+}
+
+DEFAULT_AGENTS = {
+    "epsilon_greedy": {"epsilon": 0.25, "update_rule": "exponential_smoothing", "alpha": 0.5},
+    "ucb1": {},
+    "thompson": {},
+    "discounted_ucb": {},
+    "sliding_window_ucb": {},
+}
+
+
+class ScenarioEnv:
+
+    def __init__(self, scenario, n_steps, rng):
+        self.dist = scenario["dist"]
+        self.params = np.asarray(scenario["params"], dtype=float)
+        self.after_switch = np.asarray(scenario.get("switch", scenario["params"]), dtype=float)
+        self.switch_step = n_steps // 2 if "switch" in scenario else None
+        self.rng = rng
+        self.step = 0
+
+    def current_params(self):
+        if self.switch_step is not None and self.step >= self.switch_step:
+            return self.after_switch
+        return self.params
+
+    def means(self):
+        params = self.current_params()
+        if self.dist == "rayleigh":
+            return params + 5.0 * np.sqrt(np.pi / 2)
+        return params
+
+    def get_reward(self, arm):
+        param = self.current_params()[arm]
+        self.step += 1
+        if self.dist == "rayleigh":
+            return float(np.clip(self.rng.rayleigh(5.0) + param, 5, 40))
+        return float(np.clip(self.rng.normal(param, 5), 5, 40))
+
+
+def _settled_at(greedy, best):
+    """First index from which greedy == best until the end (None if it never settles)."""
+    wrong = np.flatnonzero(greedy != best)
+    if len(wrong) == 0:
+        return 0
+    if wrong[-1] == len(greedy) - 1:
+        return None
+    return int(wrong[-1]) + 1
+
+
+def run_one(agent_name, agent_kwargs, scenario, n_steps, seed):
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    n_arms = len(scenario["params"])
+    agent = AGENTS[agent_name](n_arms=n_arms, **agent_kwargs)
+    env = ScenarioEnv(scenario, n_steps, rng)
+
+    greedy = np.empty(n_steps, dtype=int)
+    best = np.empty(n_steps, dtype=int)
+    regret = 0.0
+    pulls_best = 0
+    for t in range(n_steps):
+        means = env.means()
+        arm = agent.select_arm()
+        agent.update(arm, env.get_reward(arm))
+        best[t] = np.argmax(means)
+        greedy[t] = np.argmax(agent.get_estimated_values())
+        regret += means.max() - means[arm]
+        pulls_best += arm == best[t]
+
+    result = {"regret": regret, "best_arm_share": pulls_best / n_steps}
+    if env.switch_step is None:
+        result["probes_to_convergence"] = _settled_at(greedy, best)
+    else:
+        s = env.switch_step
+        result["probes_to_convergence"] = _settled_at(greedy[:s], best[:s])
+        result["probes_to_reconverge"] = _settled_at(greedy[s:], best[s:])
+    return result
+
+
+def _median_probes(values, limit):
+    # runs that never settled count as the full horizon
+    values = [limit if v is None else v for v in values]
+    return float(np.median(values))
+
+
+def run_benchmark(agent_configs, scenarios, n_steps, seeds):
+    rows = []
+    for scenario_name, scenario in scenarios.items():
+        horizon = n_steps // 2 if "switch" in scenario else n_steps
+        for agent_name, agent_kwargs in agent_configs.items():
+            runs = [run_one(agent_name, agent_kwargs, scenario, n_steps, seed) for seed in seeds]
+            row = {
+                "scenario": scenario_name,
+                "agent": agent_name,
+                "params": agent_kwargs,
+                "runs": len(runs),
+                "converged": float(np.mean([r["probes_to_convergence"] is not None for r in runs])),
+                "median_probes_to_convergence": _median_probes([r["probes_to_convergence"] for r in runs], horizon),
+                "best_arm_share": float(np.mean([r["best_arm_share"] for r in runs])),
+                "mean_regret": float(np.mean([r["regret"] for r in runs])),
+            }
+            if "switch" in scenario:
+                row["median_probes_to_reconverge"] = _median_probes(
+                    [r["probes_to_reconverge"] for r in runs], n_steps - horizon)
+            rows.append(row)
+    return rows
+
+
+def print_table(rows):
+    print(f"{'scenario':9s} {'agent':20s} {'conv':>5s} {'probes':>7s} {'re-conv':>8s} {'best %':>7s} {'regret':>9s}")
+    for row in rows:
+        reconverge = row.get("median_probes_to_reconverge")
+        reconverge = "-" if reconverge is None else f"{reconverge:.0f}"
+        print(f"{row['scenario']:9s} {row['agent']:20s} {row['converged']:5.0%} "
+              f"{row['median_probes_to_convergence']:7.0f} {reconverge:>8s} "
+              f"{row['best_arm_share']:7.1%} {row['mean_regret']:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare agents by probes-to-convergence.")
+    parser.add_argument("--steps", type=int, default=1000, help="probes per run")
+    parser.add_argument("--seeds", type=int, default=20, help="runs per agent and scenario")
+    parser.add_argument("--agents", default=",".join(DEFAULT_AGENTS), help="comma separated agent names")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated scenario names")
+    parser.add_argument("--output", help="also write the rows as JSON here")
+    args = parser.parse_args()
+
+    agent_configs = {name: DEFAULT_AGENTS.get(name, {}) for name in args.agents.split(",")}
+    scenarios = {name: SCENARIOS[name] for name in args.scenarios.split(",")}
+    rows = run_benchmark(agent_configs, scenarios, args.steps, list(range(args.seeds)))
+
+    print_table(rows)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import json
+import socket
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+
+# Out-of-process live dashboard. The experiment only publishes every step as
+# one JSON datagram on a non-blocking localhost UDP socket (StepPublisher) and
+# never waits for anybody; this process receives them and draws the same live
+# views as Experiment.update_live_*:
+#
+#   python dashboard.py --port 47300            # in one terminal
+#   Experiment(..., publisher=StepPublisher())  # in the experiment
+#
+# When rendering falls behind, all queued steps are folded into the
+# statistics and only the latest state is drawn (frames are dropped, steps
+# are not). If the dashboard is not running the datagrams simply go nowhere.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47300
+
+
+class StepPublisher:
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Fire-and-forget sender of experiment steps to a dashboard."""
+        self.address = (host, port)
+        self.sent = 0
+        self.dropped = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def publish(self, exptype, arm_labels, iteration, arm, arm_label, reward, q_values):
+        message = json.dumps({
+            "exptype": exptype,
+            "labels": [_jsonable(label) for label in arm_labels],
+            "iteration": int(iteration),
+            "arm": int(arm),
+            "arm_label": _jsonable(arm_label),
+            "reward": float(reward),
+            "q_values": np.asarray(q_values, dtype=float).tolist(),
+        }, separators=(",", ":")).encode()
+        try:
+            self._sock.sendto(message, self.address)
+            self.sent += 1
+        except OSError:
+            # full socket buffer or nobody listening: drop it, never block the run
+            self.dropped += 1
+
+    def close(self):
+        self._sock.close()
+
+
+def _jsonable(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class _NullLogger:
+
+    def log_step(self, **kwargs):
+        pass
+
+    def flush(self):
+        pass
+
+
+class _MirrorAgent:
+
+    def __init__(self, n_arms):
+        self.values = np.zeros(n_arms)
+
+    def get_estimated_values(self):
+        return self.values
+
+
+def _mirror_experiment(message):
+    """An Experiment without agent, testbed or logger, fed from the stream, for its live views."""
+    from experiment import Experiment
+
+    labels = message["labels"]
+    env = SimpleNamespace(channels=labels, devices=labels)
+    return Experiment(_MirrorAgent(len(labels)), env, message["exptype"], live_plot=True,
+                      logger=_NullLogger(), timing=False)
+
+
+def _receive_all(sock):
+    messages = []
+    while True:
+        try:
+            data = sock.recv(65536)
+        except BlockingIOError:
+            return messages
+        messages.append(json.loads(data))
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, fps=10):
+    import matplotlib.pyplot as plt
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # room for a few seconds of steps while a frame is being drawn
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    sock.bind((host, port))
+    sock.setblocking(False)
+    print(f"📡 Dashboard listening on udp://{host}:{port}")
+
+    mirror = None
+    run_key = None
+    last_iteration = None
+    lost = reported_lost = 0
+    last_render = 0.0
+    dirty = False
+
+    while True:
+        for message in _receive_all(sock):
+            key = (message["exptype"], tuple(message["labels"]))
+            iteration = message["iteration"]
+            if mirror is None or key != run_key or iteration <= last_iteration:
+                # a new experiment started publishing; it may already be under
+                # way, so its steps are plotted from the first iteration received
+                plt.close("all")
+                mirror = _mirror_experiment(message)
+                mirror.step_offset = iteration
+                run_key = key
+                lost = reported_lost = 0
+            else:
+                lost += iteration - last_iteration - 1
+            last_iteration = iteration
+
+            mirror.agent.values = np.asarray(message["q_values"])
+            mirror.record_step(message["iteration"], message["arm"], message["arm_label"], message["reward"])
+            # per-step Q history, so skipped frames do not leave holes in the arm curves
+            mirror._record_arm_history(mirror._arm_labels())
+            dirty = True
+
+        now = time.monotonic()
+        if dirty and now - last_render >= 1.0 / fps:
+            mirror.update_live_main_plot(last_iteration)
+            mirror.update_live_arm_plots(last_iteration)
+            mirror.update_live_arm_plots_for_each(last_iteration)
+            if lost > reported_lost:
+                print(f"⚠️ {lost} steps lost in transit so far")
+                reported_lost = lost
+            last_render = now
+            dirty = False
+
+        if mirror is not None:
+            plt.pause(0.02)   # also runs the GUI event loop
+        else:
+            time.sleep(0.02)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live dashboard for experiments publishing with StepPublisher.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--fps", type=float, default=10, help="maximum redraws per second")
+    args = parser.parse_args()
+    try:
+        serve(args.host, args.port, args.fps)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,257 @@
 import numpy as np 
-import requests
+import threading
 import time
+from session_log import SessionRecorder, SessionReplayer
+from traces import TraceRewards
 
 
-#Make a super class for wirelessEnv and subclasses wirelesschannelEnv and wirelessroutingEnv 
+# One pooled keep-alive session shared by every environment in the process, so
+# consecutive probes to the reward endpoint reuse the same TCP connection.
+# requests is imported on first use: simulated reward machines never load it.
+_http_session = None
 
-class WirelessChannelEnv:
 
-    def __init__(self, source_ip, dest_ip, channels,reward_endpoint, reward_machine):
+def configure_http_session(pool_size=10):
+    """
+    (Re)create the shared HTTP session.
 
-        """
-        Request to a testbed as a service environment to get throughput (our reward)
+    Args:
+        pool_size: Number of keep-alive connections kept per host.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
 
+    global _http_session
+    if _http_session is not None:
+        _http_session.close()
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    _http_session = session
+    return session
 
-        Args:
-            channels: List of available channels.
-            reward_endpoint: API endpoint to fetch rewards from.
 
+def get_http_session():
+    if _http_session is None:
+        configure_http_session()
+    return _http_session
+
+
+class TokenBucket:
+
+    def __init__(self, rate, burst=1):
         """
-      
-        self.source_ip = source_ip
-        self.dest_ip = dest_ip
-        self.channels = channels
-        self.reward_endpoint = reward_endpoint
-        self.reward_machine = reward_machine
-        #self.reward_url = reward_url  # store the private URL
+        Token-bucket limiter for pacing probes.
+
+        Args:
+            rate: Tokens (requests) added per second, None for no limit.
+            burst: Bucket size, i.e. how many requests may go out back to back.
         """
-        if self.reward_machine == 3 and self.reward_url:
-            try:
-                df = pd.read_csv(self.reward_url, header=None)  # ⬅️ NO HEADER
-                # assuming reward is in column index 2
-                self.reward_iter = iter(df[2].tolist())
-            except Exception as e:
-                raise RuntimeError(f"Failed to load reward data: {e}")
-       """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping only if the bucket is empty. Returns the time waited."""
+        if self.rate is None:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # reserve the token even if it is not there yet, so concurrent
+            # callers queue up behind each other instead of all waking together
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# Shared by every environment in the process. The default keeps the old
+# spacing of one probe every 2 s, but only sleeps when the previous probe was
+# less than 2 s ago (the old code slept 2 s before every attempt).
+_rate_limiter = TokenBucket(rate=0.5, burst=1)
+
+
+def configure_rate_limit(rate, burst=1):
+    """
+    Replace the process-wide probe rate limit.
+
+    Args:
+        rate: Requests per second, or None to disable pacing.
+        burst: Requests allowed back to back.
+    """
+    global _rate_limiter
+    _rate_limiter = TokenBucket(rate, burst)
+    return _rate_limiter
+
+
+def get_rate_limiter():
+    return _rate_limiter
+
+
+# Optional record/replay of the testbed traffic (see session_log.py).
+_session_recorder = None
+_session_replay = None
+
+
+def configure_session_log(record=None, replay=None, strict=False):
+    """
+    Record every testbed exchange to a JSONL session log, or replay one.
+
+    Args:
+        record: Append each request/response to this JSONL file (None = off).
+        replay: Serve responses from this recorded session instead of the
+            network (None = off). No rate limiting or retries in replay.
+        strict: In replay, raise once a link/channel runs out of recorded
+            responses instead of starting over.
+    """
+    global _session_recorder, _session_replay
+    if _session_recorder is not None:
+        _session_recorder.close()
+    _session_recorder = SessionRecorder(record) if record else None
+    _session_replay = SessionReplayer(replay, strict=strict) if replay else None
+    return _session_recorder, _session_replay
+
+
+class WirelessEnv:
+
+    # timeout of a single attempt: (connect, read) seconds, or one number for both
+    timeout = (5, 100)
+    # optional MeasurementCache shared by probes of the same link and channel
+    reward_cache = None
+
+    def post_with_retries(self, request_data):
+        """
+        POST request_data to the reward endpoint through the shared session,
+        retrying with exponential backoff. Returns the JSON body or None.
 
-    def send_request(self, channel):
-        request_data = {
-            "source": self.source_ip,
-            "destination": self.dest_ip,
-            "path": [],
-            "wireless_channel": channel
-        }
+        Where the time went is left in self.request_timing (see pop_request_timing).
+        """
+        timing = self.request_timing = {"wait": 0.0, "http": 0.0, "retry": 0.0, "attempts": 0}
+
+        cache_key = None
+        if self.reward_cache is not None:
+            cache_key = self.reward_cache.key(request_data)
+            cached = self.reward_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if _session_replay is not None:
+            return _session_replay.next_response(request_data)
+
+        import requests
 
+        session = get_http_session()
+        started = time.perf_counter()
+        status, body, error = None, None, None
 
         max_retries = 3
         delay = 2
 
         for attempt in range (1, max_retries + 1):
 
+            timing["attempts"] = attempt
+            start = time.perf_counter()
+            _rate_limiter.acquire()
+            sent = time.perf_counter()
+            timing["wait"] += sent - start
+
             try:
-                time.sleep(2)
-                response = requests.post(self.reward_endpoint, json=request_data, timeout = 100)
+                response = session.post(self.reward_endpoint, json=request_data, timeout=self.timeout)
+                timing["http"] += time.perf_counter() - sent
+                status = response.status_code
 
                 if response.status_code == 200:
-                    return response.json()
+                    body = response.json()
+                    break
                 else:
+                    error = response.text
                     print(f"❌ Attempt {attempt}: HTTP {response.status_code} - {response.text}")
             except requests.exceptions.RequestException as e:
+                timing["http"] += time.perf_counter() - sent
+                status, error = None, str(e)
                 print(f"❌ Attempt {attempt}: Request error: {e}")
             
 
             if attempt < max_retries:
                 sleep_time = delay * ( 2 ** (attempt - 1))
                 print(f"⏳ Retrying in {sleep_time} seconds...")
+                start = time.perf_counter()
                 time.sleep(sleep_time)
+                timing["retry"] += time.perf_counter() - start
             else:
                 print("🚫 All retries failed.")
-                return None
+
+        if body is not None:
+            error = None
+            if cache_key is not None and body.get("rate_mbps") is not None:
+                self.reward_cache.put(cache_key, body)
+        if _session_recorder is not None:
+            _session_recorder.record(request_data, status, body, time.perf_counter() - started,
+                                     timing["attempts"], error)
+        return body
+
+    def pop_request_timing(self):
+        """
+        Timing of the last request ({wait, http, retry, attempts} in seconds),
+        or None if no request went out since the last call (simulated rewards).
+        """
+        timing = getattr(self, "request_timing", None)
+        self.request_timing = None
+        return timing
+
+
+
+
+class WirelessChannelEnv(WirelessEnv):
+
+    def __init__(self, source_ip, dest_ip, channels,reward_endpoint, reward_machine, timeout=None, reward_trace=None,
+                 reward_cache=None):
+
+        """
+        Request to a testbed as a service environment to get throughput (our reward)
+
+
+        Args:
+            channels: List of available channels.
+            reward_endpoint: API endpoint to fetch rewards from.
+            timeout: Per-attempt HTTP timeout, (connect, read) seconds or a single number.
+            reward_trace: Trace file (or TraceRewards) replayed when reward_machine is 3.
+            reward_cache: Optional MeasurementCache reusing testbed measurements within its TTL.
+
+        """
+      
+        self.source_ip = source_ip
+        self.dest_ip = dest_ip
+        self.channels = channels
+        self.reward_endpoint = reward_endpoint
+        self.reward_machine = reward_machine
+        if timeout is not None:
+            self.timeout = timeout
+        if reward_cache is not None:
+            self.reward_cache = reward_cache
+        # reward_machine 3 replays recorded throughputs from a trace file
+        self.reward_trace = None
+        if self.reward_machine == 3:
+            if reward_trace is None:
+                raise ValueError("reward_machine 3 needs a reward_trace")
+            self.reward_trace = reward_trace if isinstance(reward_trace, TraceRewards) else TraceRewards(reward_trace)
+
+    def send_request(self, channel):
+        request_data = {
+            "source": self.source_ip,
+            "destination": self.dest_ip,
+            "path": [],
+            "wireless_channel": channel
+        }
+        return self.post_with_retries(request_data)
 
 
     def get_reward(self, channel):
@@ -93,20 +277,16 @@ class WirelessChannelEnv:
             return np.clip( np.random.normal(loc=22.5, scale=5), 5, 40)
         
         elif self.reward_machine == 3:
-            try:
-                return next(self.reward_iter)
-            except StopIteration:
-                raise RuntimeError("No more rewards available in CSV")
+            return self.reward_trace.draw(channel)
 
         elif self.reward_machine == 4:
             return 10
           
 
-#Make a super class for wirelessEnv and subclasses wirelesschannelEnv and wirelessroutingEnv 
-
-class WirelessRouteEnv:
+class WirelessRouteEnv(WirelessEnv):
 
-    def __init__(self, source_ip, dest_ip,devices, reward_endpoint, reward_machine, channel):
+    def __init__(self, source_ip, dest_ip,devices, reward_endpoint, reward_machine, channel, timeout=None, reward_trace=None,
+                 reward_cache=None):
 
         """
         Request to a testbed as a service environment to get throughput (our reward)
@@ -115,6 +295,9 @@ class WirelessRouteEnv:
         Args:
             channels: List of available channels.
             reward_endpoint: API endpoint to fetch rewards from.
+            timeout: Per-attempt HTTP timeout, (connect, read) seconds or a single number.
+            reward_trace: Trace file (or TraceRewards) replayed when reward_machine is 3.
+            reward_cache: Optional MeasurementCache reusing testbed measurements within its TTL.
 
         """
       
@@ -123,17 +306,17 @@ class WirelessRouteEnv:
         self.devices = devices
         self.reward_endpoint = reward_endpoint
         self.reward_machine = reward_machine
+        if timeout is not None:
+            self.timeout = timeout
+        if reward_cache is not None:
+            self.reward_cache = reward_cache
         self.channel = channel
-        #self.reward_url = reward_url  # store the private URL
-        """
-        if self.reward_machine == 3 and self.reward_url:
-            try:
-                df = pd.read_csv(self.reward_url, header=None)  # ⬅️ NO HEADER
-                # assuming reward is in column index 2
-                self.reward_iter = iter(df[2].tolist())
-            except Exception as e:
-                raise RuntimeError(f"Failed to load reward data: {e}")
-       """
+        # reward_machine 3 replays recorded throughputs from a trace file
+        self.reward_trace = None
+        if self.reward_machine == 3:
+            if reward_trace is None:
+                raise ValueError("reward_machine 3 needs a reward_trace")
+            self.reward_trace = reward_trace if isinstance(reward_trace, TraceRewards) else TraceRewards(reward_trace)
 
     def send_request(self, device):
         request_data = {
@@ -142,32 +325,7 @@ class WirelessRouteEnv:
             "path": [f"192.168.2.{device}"],
             "wireless_channel": self.channel
         }
-
-
-        max_retries = 3
-        delay = 2
-
-        for attempt in range (1, max_retries + 1):
-
-            try:
-                time.sleep(2)
-                response = requests.post(self.reward_endpoint, json=request_data, timeout = 100)
-
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"❌ Attempt {attempt}: HTTP {response.status_code} - {response.text}")
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Attempt {attempt}: Request error: {e}")
-            
-
-            if attempt < max_retries:
-                sleep_time = delay * ( 2 ** (attempt - 1))
-                print(f"⏳ Retrying in {sleep_time} seconds...")
-                time.sleep(sleep_time)
-            else:
-                print("🚫 All retries failed.")
-                return None
+        return self.post_with_retries(request_data)
 
     
 
@@ -194,10 +352,7 @@ class WirelessRouteEnv:
             return np.clip( np.random.normal(loc=22.5, scale=5), 5, 40)
         
         elif self.reward_machine == 3:
-            try:
-                return next(self.reward_iter)
-            except StopIteration:
-                raise RuntimeError("No more rewards available in CSV")
+            return self.reward_trace.draw(device)
 
         elif self.reward_machine == 4:
             return 10
@@ -1,9 +1,22 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from logging_utils import save_to_csv
 from datetime import datetime
+from pathlib import Path
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from checkpoint import CHECKPOINT_NAME, load_checkpoint, logged_steps_after, restore_checkpoint, save_checkpoint
 from ExperimentLogger import ExperimentLogger
+from history import History
+from timing import StepTimings, clock
+
+# matplotlib is only imported inside the plotting methods, so headless runs
+# (simulation, sweeps, benchmarks) never pay for loading it
+
+
+# live plots keep a fixed number of value labels and markers, so the cost of a
+# redraw does not grow with the number of steps
+LIVE_AVG_LABELS = 10
+LIVE_MAX_MARKERS = 50
 
 
 
@@ -14,16 +27,59 @@ from ExperimentLogger import ExperimentLogger
 
 class Experiment:
 
-    def __init__(self, agent, env, exptype):
+    def __init__(self, agent, env, exptype, live_plot=False, logger=None, timing=True, history_len=None,
+                 checkpoint_every=None, publisher=None, stopping=None, verbose=False):
         self.agent = agent
         self.env = env
         self.exptype = exptype
-        self.rewards = []
-        self.actions = []
-
-        self.logger = ExperimentLogger(
-            experiment_name=f"{exptype}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # live_plot=False is the headless mode: the loop only does
+        # select -> reward -> update -> log, no matplotlib work at all
+        self.live_plot = live_plot
+        # per-step progress prints; off by default so the loop stays lean
+        self.verbose = verbose
+        # per-step phase timings, written to timings.csv next to steps.csv
+        self.timings = StepTimings() if timing else None
+        # write checkpoint.pkl into the experiment directory every N steps (None = never)
+        self.checkpoint_every = checkpoint_every
+        # optional dashboard.StepPublisher: streams every step to an out-of-process
+        # dashboard, so the live views cost the loop one non-blocking send
+        self.publisher = publisher
+        # optional stopping.BestArmStopping: end the run (or only exploit) once
+        # the best arm is identified at the requested confidence
+        self.stopping = stopping
+        if stopping is not None:
+            stopping.start(len(self._arm_labels()))
+        self.identified_arm = None
+        self.identified_at = None
+        # step history in preallocated arrays; history_len bounds it to the
+        # last history_len steps (ring buffer) for very long runs
+        self.history_len = history_len
+        self.history = History(
+            {"arm": np.int64, "reward": np.float64, "avg_reward": np.float64}, max_len=history_len
         )
+        self.n_steps = 0
+        # iteration of the first recorded step in the plots (a dashboard that
+        # attaches to a run already under way)
+        self.step_offset = 0
+        # Q-value estimate of each arm whenever it was pulled (live arm plots)
+        self.arm_history = None
+        self._arm_history_step = 0
+
+        # running statistics, updated in O(1) per step so that plots and
+        # summaries never rescan the whole history
+        n_arms = len(self._arm_labels())
+        self.arm_counts = np.zeros(n_arms)
+        self.arm_reward_sums = np.zeros(n_arms)
+        self.arm_reward_sumsq = np.zeros(n_arms)
+        self.total_reward = 0.0
+        self.avg_reward_min = np.inf
+        self.avg_reward_max = -np.inf
+
+        if logger is None:
+            logger = ExperimentLogger(
+                experiment_name=f"{exptype}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            )
+        self.logger = logger
 
 
 
@@ -36,65 +92,64 @@ class Experiment:
         self.arm_fig = None
         self.arm_axes = {}
 
+        self.individual_figs = {}
+        self.individual_axes = {}
+        self.individual_views = {}
+        self.individual_blits = {}
 
 
-    def run(self, n_trials):
-        for i in range(n_trials):
 
-            
-            print(f"Entering trial number: {i + 1}")
-            if self.exptype == 'optimal_channel':
-                 arm = self.agent.select_arm()
-                 channel = self.env.channels[arm]
-                 print(f"DEBUG - selected arm index: {arm}, channel value: {channel}")  # Add this too
-                 reward = self.env.get_reward(channel)
-                 self.agent.update(arm, reward)
-                 self.actions.append(channel)
-                 self.rewards.append(reward)
-                 row = [{
-                    "Iteration": i,
-                    "Channel": channel,
-                    "Reward": reward,
-                    "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                 }]
-            elif self.exptype == 'optimal_route':
-                arm = self.agent.select_arm() 
-                print(arm)
-                device = self.env.devices[arm]
-                print(device)
-                print(f"DEBUG - selected arm index: {arm}, device ip value: {device}")
-                #time.sleep(1)
-                reward = self.env.get_reward(device)
-                self.agent.update(arm, reward)
-                self.actions.append(device)
-                self.rewards.append(reward)
-                row = [{
-                    "Iteration": i,
-                    "Device": device,
-                    "Reward": reward,
-                    "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                 }]
-
-
-            #save_to_csv(row) # we save each iteration as a row of a data bank so we can replay the experiment again if we desire
-            q_values = self.agent.get_estimated_values()
-
-            self.logger.log_step(
-                    iteration=i,
-                    arm_index=arm,
-                    arm_label=self.actions[-1],
-                    reward=reward,
-                    q_values=q_values
-                )
-            self.update_live_main_plot(i)
-            self.update_live_arm_plots(i)
-            self.update_live_arm_plots_for_each(i)
-
-
-            if i == 200 or i == n_trials - 1:
-                plt.ioff()
-                print(f"Iteration {i}: All diagrams frozen. Close windows to exit.")
-                plt.show(block=True)
+    def run(self, n_trials):
+        arm_labels = self._arm_labels()
+        entity = "device ip" if self.exptype == 'optimal_route' else "channel"
+        timings = self.timings
+        if timings is not None:
+            timings.reserve(n_trials)
+        # duck-typed environments that only provide get_reward have no request split
+        pop_request_timing = getattr(self.env, "pop_request_timing", None)
+
+        # a resumed experiment picks up after its last completed step
+        for i in range(self.n_steps, n_trials):
+
+            if self._stop_requested():
+                break
+            if self.verbose:
+                print(f"Entering trial number: {i + 1}")
+            step_start = clock()
+
+            arm = self._select_arm()
+            t_select = clock()
+            label = arm_labels[arm]
+            if self.verbose:
+                print(f"DEBUG - selected arm index: {arm}, {entity} value: {label}")
+            t_request = clock()
+            reward = self.env.get_reward(label)
+            t_reward = clock()
+            self.agent.update(arm, reward)
+            t_update = clock()
+
+            self.record_step(i, arm, label, reward)
+            t_log = clock()
+
+            if self.live_plot:
+                self._update_live_plots(i, n_trials)
+
+            if timings is not None:
+                slot = timings.start_step(i)
+                timings.add(slot, "select", t_select - step_start)
+                timings.add(slot, "reward", t_reward - t_request)
+                if pop_request_timing is not None:
+                    timings.add_request(slot, pop_request_timing())
+                timings.add(slot, "update", t_update - t_reward)
+                timings.add(slot, "log", t_log - t_update)
+                t_end = clock()
+                timings.add(slot, "plot", t_end - t_log)
+                timings.add(slot, "total", t_end - step_start)
+
+            if self.checkpoint_every and (i + 1) % self.checkpoint_every == 0:
+                self.checkpoint()
+
+            self._best_arm_identified()
             
         
             # halfway checkpoint
@@ -106,7 +161,267 @@ class Experiment:
                 self.plot_avg_reward_per_arm_over_time()  # show the first-half plot
             """
 
-    def plot(self):
+        # the logger buffers rows; make them visible once the run is over
+        # (an interrupted run is flushed by the logger's atexit hook)
+        self.logger.flush()
+        if self.checkpoint_every:
+            self.checkpoint()
+
+        if timings is not None:
+            timings.save(self.logger.dir / "timings.csv")
+            timings.print_summary()
+
+    def run_pipelined(self, n_trials, depth=4):
+        """
+        Like run, but keeps up to `depth` probes in flight so the measurement
+        latency overlaps with updating, logging and plotting. Arms are handed
+        out ahead of time (agent.select_arm_pending) and each reward is fed
+        back as soon as its probe returns; steps are numbered in completion order.
+        """
+        arm_labels = self._arm_labels()
+        timings = self.timings
+        if timings is not None:
+            timings.reserve(n_trials)
+
+        def probe(label):
+            start = clock()
+            reward = self.env.get_reward(label)
+            return reward, clock() - start
+
+        in_flight = {}   # future -> (agent ticket, arm); no ticket for arms the agent did not choose
+        issued = self.n_steps
+
+        with ThreadPoolExecutor(max_workers=depth) as pool:
+            for i in range(self.n_steps, n_trials):
+
+                # keep the pipeline full (after a "stop" identification only drain it)
+                stopped = self._stop_requested()
+                while issued < n_trials and len(in_flight) < depth and not stopped:
+                    if self.identified_arm is not None:
+                        ticket, arm = None, self.identified_arm
+                    elif self.stopping is not None and self.stopping.sampling == "lucb":
+                        pending = np.bincount([a for _, a in in_flight.values()], minlength=len(arm_labels))
+                        ticket, arm = None, self.stopping.select_arm(pending)
+                    else:
+                        ticket, arm = self.agent.select_arm_pending()
+                    in_flight[pool.submit(probe, arm_labels[arm])] = (ticket, arm)
+                    issued += 1
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                step_start = clock()
+                ticket, arm = in_flight.pop(future)
+                reward, probe_time = future.result()
+
+                if self.verbose:
+                    print(f"Completed trial number: {i + 1} ({len(in_flight)} probes in flight)")
+                if ticket is None:
+                    self.agent.update(arm, reward)
+                else:
+                    self.agent.complete_pending(ticket, reward)
+                t_update = clock()
+
+                self.record_step(i, arm, arm_labels[arm], reward)
+                t_log = clock()
+
+                if self.live_plot:
+                    self._update_live_plots(i, n_trials)
+
+                if timings is not None:
+                    # the probes overlap, so only their own latency is known,
+                    # not how it splits into wait/http/retry
+                    slot = timings.start_step(i)
+                    timings.add(slot, "reward", probe_time)
+                    timings.add(slot, "update", t_update - step_start)
+                    timings.add(slot, "log", t_log - t_update)
+                    t_end = clock()
+                    timings.add(slot, "plot", t_end - t_log)
+                    timings.add(slot, "total", t_end - step_start)
+
+                if self.checkpoint_every and (i + 1) % self.checkpoint_every == 0:
+                    self.checkpoint()
+
+                self._best_arm_identified()
+
+        self.logger.flush()
+        if self.checkpoint_every:
+            self.checkpoint()
+
+        if timings is not None:
+            timings.save(self.logger.dir / "timings.csv")
+            timings.print_summary()
+
+    def _select_arm(self):
+        # pure exploitation once the best arm is identified in "exploit" mode
+        if self.identified_arm is not None:
+            return self.identified_arm
+        # until then the stopping rule picks the arms that are still ambiguous
+        if self.stopping is not None and self.stopping.sampling == "lucb":
+            return self.stopping.select_arm()
+        return self.agent.select_arm()
+
+    def _stop_requested(self):
+        # the best arm is known and the stopping rule says to end the run
+        return self.identified_arm is not None and self.stopping is not None and self.stopping.mode == "stop"
+
+    def _best_arm_identified(self):
+        """Check the stopping rule after a step; True once the best arm is known."""
+        if self.stopping is None:
+            return False
+        if self.identified_arm is None:
+            arm = self.stopping.check()
+            if arm is None:
+                return False
+            self.identified_arm = arm
+            self.identified_at = self.n_steps
+            action = "stopping" if self.stopping.mode == "stop" else "exploiting it from now on"
+            print(f"🏁 Best arm {self._arm_labels()[arm]} identified after {self.n_steps} steps "
+                  f"at {self.stopping.confidence:.0%} confidence, {action}")
+        return True
+
+    def checkpoint(self):
+        """Write checkpoint.pkl next to the step log (flushed first, so it never lags behind)."""
+        self.logger.flush()
+        save_checkpoint(self, self.logger.dir / CHECKPOINT_NAME)
+
+    @classmethod
+    def resume(cls, agent, env, exptype, exp_dir, live_plot=False, timing=True, checkpoint_every=None,
+               stopping=None, verbose=False, **logger_kwargs):
+        """
+        Rebuild an interrupted experiment from the checkpoint in exp_dir; then
+        call run(n_trials) with the total number of trials to finish it.
+
+        agent and env are built the same way as for the original run. Steps
+        that reached steps.csv after the checkpoint are fed to the agent from
+        the log instead of being probed again. The stopping rule of the
+        original run comes back from the checkpoint unless `stopping` replaces
+        it (the new rule then starts without evidence).
+        The random stream restarts at the checkpoint, so the resumed run is not
+        bit-identical to one that was never interrupted (see checkpoint.py).
+        """
+        exp_dir = Path(exp_dir)
+        state = load_checkpoint(exp_dir / CHECKPOINT_NAME)
+        logger = ExperimentLogger(exp_dir.name, base_dir=exp_dir.parent, resume=True, **logger_kwargs)
+        exp = cls(agent, env, exptype, live_plot=live_plot, logger=logger, timing=timing,
+                  checkpoint_every=checkpoint_every, verbose=verbose)
+        restore_checkpoint(exp, state)
+
+        arm_labels = exp._arm_labels()
+        trace = getattr(env, "reward_trace", None)
+        for arm, reward in logged_steps_after(logger.csv_path, exp.n_steps):
+            if trace is not None:
+                # the logged step already used this trace sample
+                trace.draw(arm_labels[arm])
+            exp.agent.update(arm, reward)
+            exp._update_running_stats(arm, reward)
+            exp._record_arm_history(arm_labels)
+
+        if stopping is not None:
+            # a replacing rule only collects evidence from here on
+            stopping.start(len(arm_labels))
+            exp.stopping = stopping
+        print(f"Resuming {exp_dir} after {exp.n_steps} completed steps")
+        return exp
+
+    def _update_live_plots(self, i, n_trials):
+        import matplotlib.pyplot as plt
+
+        self.update_live_main_plot(i)
+        self.update_live_arm_plots(i)
+        self.update_live_arm_plots_for_each(i)
+
+
+        if i == 200 or i == n_trials - 1:
+            plt.ioff()
+            print(f"Iteration {i}: All diagrams frozen. Close windows to exit.")
+            plt.show(block=True)
+
+    def record_step(self, iteration, arm, arm_label, reward):
+        """
+        Book a finished step (the agent is already updated): history,
+        running statistics and the step log.
+        """
+        self._update_running_stats(arm, reward)
+
+        q_values = self.agent.get_estimated_values()
+
+        self.logger.log_step(
+                iteration=iteration,
+                arm_index=arm,
+                arm_label=arm_label,
+                reward=reward,
+                q_values=q_values
+            )
+        if self.publisher is not None:
+            self.publisher.publish(self.exptype, self._arm_labels(), iteration, arm, arm_label, reward, q_values)
+
+    def _update_running_stats(self, arm, reward):
+        self.arm_counts[arm] += 1
+        self.arm_reward_sums[arm] += reward
+        self.arm_reward_sumsq[arm] += reward * reward
+        self.total_reward += reward
+        self.n_steps += 1
+        if self.stopping is not None:
+            self.stopping.observe(arm, reward)
+
+        avg = self.total_reward / self.n_steps
+        self.history.append(arm=arm, reward=reward, avg_reward=avg)
+        self.avg_reward_min = min(self.avg_reward_min, avg)
+        self.avg_reward_max = max(self.avg_reward_max, avg)
+
+    @property
+    def rewards(self):
+        return self.history.column("reward")
+
+    @property
+    def actions(self):
+        # arm labels of the stored steps
+        return np.asarray(self._arm_labels())[self.history.column("arm")]
+
+    @property
+    def avg_reward_history(self):
+        # cumulative average reward after each stored step
+        return self.history.column("avg_reward")
+
+    def arm_mean_rewards(self):
+        """Average reward of each arm so far (nan for arms never pulled)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.arm_reward_sums / self.arm_counts
+
+    def arm_reward_stds(self):
+        """Standard deviation of the reward of each arm so far (nan for arms never pulled)."""
+        means = self.arm_mean_rewards()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = self.arm_reward_sumsq / self.arm_counts - means ** 2
+        return np.sqrt(np.maximum(variance, 0))
+
+    def summary(self):
+        """
+        Summary of the run read from the running statistics.
+        """
+        n_steps = self.n_steps
+        means = self.arm_mean_rewards()
+        stds = self.arm_reward_stds()
+        return {
+            "n_steps": n_steps,
+            "average_reward": self.total_reward / n_steps if n_steps else None,
+            "identified_arm": None if self.identified_arm is None else self._arm_labels()[self.identified_arm],
+            "identified_at": self.identified_at,
+            "arms": [
+                {
+                    "arm": label,
+                    "count": int(self.arm_counts[idx]),
+                    "mean_reward": None if np.isnan(means[idx]) else float(means[idx]),
+                    "std_reward": None if np.isnan(stds[idx]) else float(stds[idx]),
+                }
+                for idx, label in enumerate(self._arm_labels())
+            ],
+        }
+
+    def plot(self, save_path=None):
+        import matplotlib.pyplot as plt
 
         # --- LABELS BASED ON EXPERIMENT TYPE ---
         if self.exptype == 'optimal_route':
@@ -120,11 +435,11 @@ class Experiment:
         # 1. Apply a modern style
         plt.style.use('ggplot')
         
-        if len(self.rewards) == 0:
+        if self.n_steps == 0:
             raise ValueError("No data to plot. Run experiment.run(n_trials) first.")
 
-        steps = np.arange(1, len(self.rewards) + 1)
-        avg_reward = np.cumsum(self.rewards) / steps  # cumulative average reward
+        steps = self.history.positions() + 1 + self.step_offset
+        avg_reward = self.avg_reward_history  # cumulative average reward
 
         # 2. Increase figure size for better clarity
         fig, axs = plt.subplots(2, 1, figsize=(12, 10))
@@ -148,12 +463,11 @@ class Experiment:
 
 
         # --- Subplot 2: Average Reward per Channel (Bar Chart) ---
-        unique_channels = list(dict.fromkeys(self.actions))
-        avg_rewards_per_channel = []
-        for ch in unique_channels:
-            ch_rewards = [r for (a, r) in zip(self.actions, self.rewards) if a == ch]
-            avg_rewards_per_channel.append(np.mean(ch_rewards))
-            
+        all_arms = self._arm_labels()
+        means = self.arm_mean_rewards()
+        unique_channels = [all_arms[idx] for idx in np.flatnonzero(self.arm_counts)]
+        avg_rewards_per_channel = [means[idx] for idx in np.flatnonzero(self.arm_counts)]
+
         # Sort channels by their average reward for better visual comparison
         sorted_data = sorted(zip(avg_rewards_per_channel, unique_channels), reverse=True)
         sorted_rewards = [d[0] for d in sorted_data]
@@ -181,21 +495,27 @@ class Experiment:
 
 
         plt.tight_layout(rect=[0, 0, 1, 0.96])
-        plt.show()
+        _show_or_save(fig, save_path)
         
         # Restore default style
         plt.style.use('default')
 
 
     # line plots for each arm
-    def plot_avg_reward_per_arm_over_time(self):
+    def plot_avg_reward_per_arm_over_time(self, save_path=None):
+        import matplotlib.pyplot as plt
+
         # 1. Apply a modern style
         plt.style.use('ggplot')
         
-        if len(self.rewards) == 0:
+        if self.n_steps == 0:
             raise ValueError("No data to plot. Run experiment.run(n_trials) first.")
 
-        arms = list(dict.fromkeys(self.actions))  # unique arm labels
+        actions = self.actions
+        rewards = self.rewards
+        # step numbers of the stored rows (a ring buffer or a resumed run does not start at 1)
+        positions = self.history.positions() + 1 + self.step_offset
+        arms = list(dict.fromkeys(actions))  # unique arm labels
         n_arms = len(arms)
 
         # 2. Adjust figure size and apply main title styling
@@ -217,11 +537,11 @@ class Experiment:
             steps = []
 
             # Build the arm-specific average reward over time
-            for t, (a, r) in enumerate(zip(self.actions, self.rewards), start=1):
+            for t, a, r in zip(positions, actions, rewards):
                 if a == arm:
                     count += 1
                     cumulative_sum += r
-                    arm_avg_rewards.append(self.rewards)  # cumulative_sum / count
+                    arm_avg_rewards.append(cumulative_sum / count)
                     steps.append(t)
 
             ax = axs[idx]
@@ -253,317 +573,385 @@ class Experiment:
 
         axs[-1].set_xlabel("Step (Iteration)", fontsize=14)
         plt.tight_layout(rect=[0, 0, 1, 0.96])
-        plt.show()
+        _show_or_save(fig, save_path)
         
         # Restore default style
         plt.style.use('default')
     
-    def update_live_main_plot(self, iteration):
+    def _arm_labels(self):
+        # channels for the channel experiment, relay devices for the route experiment
+        if self.exptype == 'optimal_route':
+            return self.env.devices
+        return self.env.channels
+
+    def _init_live_main_plot(self):
+        import matplotlib.pyplot as plt
+
         # --- LABELS BASED ON EXPERIMENT TYPE ---
         if self.exptype == 'optimal_route':
             entity_singular = "Route"
-            entity_plural = "Routes"
             main_title = "Live Optimal Route Selection"
         else:
             entity_singular = "Channel"
-            entity_plural = "Channels"
             main_title = "Live Channel Performance"
-        # 1. Apply a modern style
-        plt.style.use('ggplot')
-        plt.ion()
 
-        # Get all channels from environment (needed for consistent bar colors)
-        all_arms = self.env.channels
-        colors = plt.cm.get_cmap('Dark2', len(all_arms))
+        all_arms = self._arm_labels()
+        n_arms = len(all_arms)
+        colors = plt.cm.get_cmap('Dark2', n_arms)
 
-        # --- GET ESTIMATED Q-VALUES FOR DYNAMIC SUBTITLE ---
-        # Call the getter method to retrieve the current estimated values (Q-values)
-        current_q_values = self.agent.get_estimated_values()
-        
-        # Find the index (channel number) of the maximum Q-value
-        # Use np.argmax to find the index of the best channel
-        best_channel_index = np.argmax(current_q_values) #best_device_index = np.argmax(current_q_values) 
-        best_value = current_q_values[best_channel_index]#best_value = current_q_values[best_device_index]
-        # Assuming channel names are what's in all_arms, which corresponds to the index
-        # Note: If all_arms is a list of channel identifiers, use all_arms[best_channel_index]
-        best_channel_name = all_arms[best_channel_index]#best_device_name = all_arms[best_device_index]
-        
-        # Create the dynamic text string
-        dynamic_subtitle = f"Best Estimated {entity_singular}: {best_channel_name} (Value: {best_value:.2f})"
-        # --------------------------------------------------
-        
-        if self.live_fig is None:
+        plt.ion()
+        with plt.style.context('ggplot'):
             # Increase figure size for better visual separation
             self.live_fig, (self.ax_avg, self.ax_bar) = plt.subplots(2, 1, figsize=(12, 9))
             self.live_fig.suptitle(main_title,
                        fontsize=18, fontweight='bold', color='#444444')
-            # --- INITIAL SUBTITLE PLACEMENT (Placeholder) ---
-            # Initialize the dynamic text object; we will update its content later
-            # We store the reference to update it efficiently
-            self.best_channel_text = self.live_fig.text(x=0.5, 
+            # Dynamic subtitle, only its text changes afterwards
+            self.best_channel_text = self.live_fig.text(x=0.5,
                                                         y=0.93, # Positioning the subtitle
-                                                        s=dynamic_subtitle, 
-                                                        fontsize=12, 
+                                                        s=f"Best Estimated {entity_singular}: None",
+                                                        fontsize=12,
                                                         color='#008000', # Use a bold color like green
                                                         fontweight='semibold',
                                                         ha='center')
-        else:
-            # --- UPDATE SUBTITLE ---
-            # If the figure already exists, just update the text object's content
-            # self.best_channel_text.set_text(dynamic_subtitle)
-            print("")
 
-        steps = np.arange(1, len(self.rewards)+ 1)
-        avg_reward = np.cumsum(self.rewards) / steps
-
-        # --- Update line plot (Cumulative Average) ---
-        self.ax_avg.clear()
-        
-        # 2. Add bold markers and use fill
-        self.ax_avg.plot(steps, avg_reward, 
-                         color='#E69F00', 
-                         linewidth=3, 
-                         marker='o',          # Add marker
-                         markersize=7,        # Bold marker size
-                         markeredgecolor='black',
-                         markerfacecolor='#E69F00',
-                         label="Cumulative Avg Reward"
+            # --- Line plot (Cumulative Average), artists are created once and updated in place ---
+            self.avg_line, = self.ax_avg.plot([], [],
+                             color='#E69F00',
+                             linewidth=3,
+                             marker='o',
+                             markersize=7,
+                             markeredgecolor='black',
+                             markerfacecolor='#E69F00',
+                             label="Cumulative Avg Reward"
+            )
+            self.avg_fill = self.ax_avg.fill_between([], [], color='#E69F00', alpha=0.1)
+            # A fixed pool of value labels spread along the curve (instead of one per 5th step)
+            self.avg_labels = [
+                self.ax_avg.text(0, 0, '', color='black', fontsize=9, ha='center', va='bottom', fontweight='bold')
+                for _ in range(LIVE_AVG_LABELS)
+            ]
+            self.ax_avg.set_xlim(0, 10)
+
+            self.ax_avg.set_title("Cumulative Average Reward Over Time", loc='left', fontsize=14, fontweight='bold')
+            self.ax_avg.set_xlabel("Step (Iteration)", fontsize=12)
+            self.ax_avg.set_ylabel("Avg Reward", fontsize=12)
+            self.ax_avg.grid(True, linestyle='-', alpha=0.4)
+            self.ax_avg.spines['right'].set_visible(False)
+            self.ax_avg.spines['top'].set_visible(False)
+
+            # --- Bar chart (Channel Comparison), one bar per arm, re-sorted through heights/colors ---
+            self.live_bars = list(self.ax_bar.bar(range(n_arms), np.zeros(n_arms),
+                                                  color=[colors(idx) for idx in range(n_arms)]))
+            self.bar_labels = [
+                self.ax_bar.text(idx, 0, '', ha='center', va='bottom', fontsize=10)
+                for idx in range(n_arms)
+            ]
+            self.live_bar_order = None
+            self.ax_bar.set_xticks(range(n_arms))
+            self.ax_bar.set_xticklabels([''] * n_arms)
+
+            self.ax_bar.set_title(
+                f"Average Reward per {entity_singular} (Current)",
+                loc='left', fontsize=14, fontweight='bold', pad=20
+            )
+            self.ax_bar.set_xlabel(entity_singular, fontsize=12)
+            self.ax_bar.set_ylabel("Avg Reward", fontsize=12)
+            self.ax_bar.grid(axis='y', linestyle='-', alpha=0.4)
+            self.ax_bar.spines['right'].set_visible(False)
+            self.ax_bar.spines['top'].set_visible(False)
+
+            self.live_fig.tight_layout(rect=[0, 0, 1, 0.96])
+
+        self.live_main_blit = BlitManager(
+            self.live_fig,
+            [self.avg_line, self.avg_fill, *self.avg_labels,
+             *self.live_bars, *self.bar_labels, self.best_channel_text]
         )
-        self.ax_avg.fill_between(steps, avg_reward, color='#E69F00', alpha=0.1)
-        
-        # 3. Add text annotation above each marker
-        for s, avg in zip(steps, avg_reward):
-            # Only annotate every 5th step or the last step to prevent clutter
-            if s % 5 == 0 or s == steps[-1]:
-                self.ax_avg.text(s, avg + (max(avg_reward) - min(avg_reward)) * 0.02, # Offset text slightly above
-                                 f'{avg:.2f}',
-                                 color='black', fontsize=9, ha='center', va='bottom', fontweight='bold')
-
-
-        # Refined titles, labels, and grid
-        self.ax_avg.set_title("Cumulative Average Reward Over Time", loc='left', fontsize=14, fontweight='bold')
-        self.ax_avg.set_xlabel("Step (Iteration)", fontsize=12)
-        self.ax_avg.set_ylabel("Avg Reward", fontsize=12)
-        self.ax_avg.grid(True, linestyle='-', alpha=0.4)
-        
-        # Remove top and right spines
-        self.ax_avg.spines['right'].set_visible(False)
-        self.ax_avg.spines['top'].set_visible(False)
-
-
-        # --- Update bar chart (Channel Comparison) ---
-        unique = list(dict.fromkeys(self.actions))
-        bar_values = [
-            np.mean([r for (a, r) in zip(self.actions, self.rewards) if a == ch])
-            for ch in unique
-        ]
-
-        # Sort bars by value for easy comparison
-        sorted_data = sorted(zip(bar_values, unique), reverse=True)
-        sorted_rewards = [d[0] for d in sorted_data]
-        sorted_channels = [str(d[1]) for d in sorted_data]
-        
-        self.ax_bar.clear()
-        
-        # 4. Determine colors for the bars based on their original channel value position in all_arms
-        bar_colors = [colors(all_arms.index(float(ch))) for ch in sorted_channels]
-        
-        # Plot bars using the consistent colors
-        bars = self.ax_bar.bar(sorted_channels, sorted_rewards, color=bar_colors)
-        
-        # Add reward labels on top of the bars
-        for bar in bars:
-            height = bar.get_height()
-            self.ax_bar.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                             f'{height:.2f}',
-                             ha='center', va='bottom', fontsize=10)
 
+    def update_live_main_plot(self, iteration):
+        import matplotlib.pyplot as plt
 
-        self.ax_bar.set_title(
-            f"Average Reward per {entity_singular} (Current)",
-            loc='left', fontsize=14, fontweight='bold', pad=20
-        )
-        self.ax_bar.set_xlabel(entity_singular, fontsize=12)
-        self.ax_bar.set_ylabel("Avg Reward", fontsize=12)
-        self.ax_bar.grid(axis='y', linestyle='-', alpha=0.4)
+        if self.live_fig is None:
+            self._init_live_main_plot()
 
-        # Remove top and right spines
-        self.ax_bar.spines['right'].set_visible(False)
-        self.ax_bar.spines['top'].set_visible(False)
+        entity_singular = "Route" if self.exptype == 'optimal_route' else "Channel"
+        all_arms = self._arm_labels()
+        colors = plt.cm.get_cmap('Dark2', len(all_arms))
 
-        # update subtitle FIRST
-        self.live_fig.tight_layout(rect=[0, 0, 1, 0.96])
-        self.live_fig.canvas.draw()
-        self.live_fig.canvas.flush_events()
+        # --- GET ESTIMATED Q-VALUES FOR DYNAMIC SUBTITLE ---
+        current_q_values = self.agent.get_estimated_values()
+        best_channel_index = np.argmax(current_q_values)
+        best_value = current_q_values[best_channel_index]
+        best_channel_name = all_arms[best_channel_index]
 
         if iteration == 0:
             self.best_channel_text.set_text(f"Best Estimated {entity_singular}: None")
-
         else:
-            self.best_channel_text.set_text(dynamic_subtitle)
+            self.best_channel_text.set_text(
+                f"Best Estimated {entity_singular}: {best_channel_name} (Value: {best_value:.2f})"
+            )
 
-        # One more lightweight draw to update just the subtitle
-        self.live_fig.canvas.draw_idle()
-        # Restore default style
-        plt.style.use('default')
+        steps = self.history.positions() + 1 + self.step_offset
+        avg_reward = self.avg_reward_history
 
-       
-    def update_live_arm_plots(self, iteration):
-        plt.style.use('ggplot')
-        plt.ion()
+        # --- Update line plot (Cumulative Average) ---
+        self.avg_line.set_data(steps, avg_reward)
+        self.avg_line.set_markevery(max(1, len(steps) // LIVE_MAX_MARKERS))
+        self.avg_fill.set_verts([_fill_verts(steps, avg_reward)])
+
+        label_positions = np.unique(np.linspace(0, len(steps) - 1, LIVE_AVG_LABELS).astype(int))
+        offset = (self.avg_reward_max - self.avg_reward_min) * 0.02 # Offset text slightly above
+        for k, text in enumerate(self.avg_labels):
+            if k < len(label_positions):
+                j = label_positions[k]
+                text.set_position((steps[j], avg_reward[j] + offset))
+                text.set_text(f'{avg_reward[j]:.2f}')
+            else:
+                text.set_text('')
 
-        all_arms = self.env.channels
-        
-        # --- TRACKING THE LEARNING CURVE ---
-        if not hasattr(self, 'q_value_history_per_arm'):
-            self.q_value_history_per_arm = {arm: [] for arm in all_arms}
-            self.step_history_per_arm = {arm: [] for arm in all_arms}
-
-        if len(self.actions) > 0:
-            last_action = self.actions[-1]
-            current_estimates = self.agent.get_estimated_values()
-            action_idx = all_arms.index(last_action)
-            
-            # Capture the actual estimate at this specific moment
-            self.q_value_history_per_arm[last_action].append(current_estimates[action_idx])
-            self.step_history_per_arm[last_action].append(len(self.actions))
+        full_redraw = _grow_xlim(self.ax_avg, steps[-1])
+        full_redraw |= _fit_ylim(self.ax_avg, self.avg_reward_min, self.avg_reward_max)
 
-        if self.arm_fig is None:
-            n_arms = len(all_arms)
-            # Increase height significantly to prevent squashing
-            self.arm_fig, axs = plt.subplots(n_arms, 1, figsize=(12, 5 * n_arms)) 
-            self.arm_axes = axs if n_arms > 1 else [axs]
-            self.arm_fig.suptitle("Live Agent Q-Value Estimates", fontsize=20, fontweight='bold')
+        # --- Update bar chart (Channel Comparison) ---
+        means = self.arm_mean_rewards()
+        sampled = [(means[idx], idx) for idx in np.flatnonzero(self.arm_counts)]
+
+        # Sort bars by value for easy comparison, unsampled arms stay empty at the end
+        sampled.sort(reverse=True)
+        order = tuple(idx for _, idx in sampled)
+
+        for pos, bar in enumerate(self.live_bars):
+            label = self.bar_labels[pos]
+            if pos < len(sampled):
+                height, idx = sampled[pos]
+                bar.set_height(height)
+                bar.set_color(colors(idx))
+                label.set_position((pos, height + 0.5))
+                label.set_text(f'{height:.2f}')
+            else:
+                bar.set_height(0)
+                label.set_text('')
 
-        colors = plt.cm.get_cmap('Dark2', len(all_arms)) 
+        if order != self.live_bar_order:
+            # tick labels live in the cached background, so a new order needs a full draw
+            self.live_bar_order = order
+            tick_labels = [str(all_arms[idx]) for idx in order]
+            self.ax_bar.set_xticklabels(tick_labels + [''] * (len(all_arms) - len(order)))
+            full_redraw = True
 
-        for idx, ax in enumerate(self.arm_axes):
-            arm_identity = all_arms[idx]
-            steps = self.step_history_per_arm[arm_identity]
-            q_vals = self.q_value_history_per_arm[arm_identity]
+        full_redraw |= _fit_ylim(self.ax_bar, 0, sampled[0][0], floor=0) if sampled else False
 
-            ax.clear()
-            
-            if len(steps) > 1:
-                color = colors(idx)
-                ax.plot(steps, q_vals, color=color, linewidth=3, marker='o', markersize=6)
-                ax.fill_between(steps, q_vals, color=color, alpha=0.1)
-
-                # --- THE "ZOOM" FIX: LOGARITHMIC OR WINDOWED SCALING ---
-                # We ignore the first few points if they are outliers (the 300+ values)
-                # to focus on the stabilized values (the 15-40 range)
-                focus_data = q_vals[int(len(q_vals)*0.2):] if len(q_vals) > 5 else q_vals
-                
-                v_min, v_max = min(focus_data), max(focus_data)
-                # Add a tiny 10% margin
-                margin = (v_max - v_min) * 0.1 if v_max != v_min else 1.0
-                
-                # FORCE the axis to stay within the 'learned' range
-                ax.set_ylim(v_min - margin, v_max + margin)
-
-                # Final value label
-                ax.annotate(f'Final: {q_vals[-1]:.2f}', xy=(steps[-1], q_vals[-1]), 
+        self.live_main_blit.update(full_redraw)
+
+    def _record_arm_history(self, all_arms):
+        # --- TRACKING THE LEARNING CURVE ---
+        if self.arm_history is None:
+            self.arm_history = {
+                arm: History({"step": np.int64, "q_value": np.float64}, capacity=256, max_len=self.history_len)
+                for arm in all_arms
+            }
+
+        # both arm views ask for it every step, record each step only once
+        if self.n_steps == 0 or self._arm_history_step == self.n_steps:
+            return
+        self._arm_history_step = self.n_steps
+
+        action_idx = int(self.history.last("arm"))
+        current_estimates = self.agent.get_estimated_values()
+
+        # Capture the actual estimate at this specific moment
+        self.arm_history[all_arms[action_idx]].append(step=self.step_offset + self.n_steps, q_value=current_estimates[action_idx])
+
+    def _init_arm_view(self, ax, arm_identity, color):
+        # Persistent artists of one arm's Q-value curve
+        line, = ax.plot([], [], color=color, linewidth=3, marker='o', markersize=6)
+        fill = ax.fill_between([], [], color=color, alpha=0.1)
+        final = ax.annotate('', xy=(0, 0),
                             xytext=(10, 0), textcoords='offset points',
                             bbox=dict(boxstyle='round', fc='white', ec=color, alpha=0.8),
                             fontweight='bold')
-            
-            elif len(steps) == 1:
-                # Single point case
-                ax.scatter(steps, q_vals, color=colors(idx), s=100)
-                ax.text(steps[0], q_vals[0], f'Initial: {q_vals[0]:.2f}')
-            else:
-                ax.text(0.5, 0.5, 'ARM NOT YET SAMPLED', ha='center', va='center', 
-                        transform=ax.transAxes, color='gray', fontsize=12)
+        final.set_visible(False)
+        placeholder = ax.text(0.5, 0.5, 'ARM NOT YET SAMPLED', ha='center', va='center',
+                              transform=ax.transAxes, color='gray', fontsize=12)
+        ax.set_xlim(0, 10)
 
-            ax.set_title(f"Channel {arm_identity}", loc='left', fontsize=15, fontweight='bold')
-            ax.set_ylabel("Estimate")
-            ax.grid(True, linestyle=':', alpha=0.6)
+        ax.set_title(f"Channel {arm_identity}", loc='left', fontsize=15, fontweight='bold')
+        ax.set_ylabel("Estimate")
+        ax.grid(True, linestyle=':', alpha=0.6)
 
-        self.arm_axes[-1].set_xlabel("Iterations")
-        self.arm_fig.tight_layout(rect=[0, 0, 1, 0.95])
-        
-        self.arm_fig.canvas.draw()
-        self.arm_fig.canvas.flush_events()
+        return {'ax': ax, 'line': line, 'fill': fill, 'final': final, 'placeholder': placeholder}
 
-        plt.style.use('default')
+    def _update_arm_view(self, view, steps, q_vals):
+        """Push one arm's history into its artists; returns True if the axis limits moved."""
+        n = len(steps)
+        view['placeholder'].set_visible(n == 0)
+        if n == 0:
+            return False
 
+        steps = np.asarray(steps)
+        q_vals = np.asarray(q_vals, dtype=float)
 
-    def update_live_arm_plots_for_each(self, iteration):
-        plt.style.use('ggplot')
-        plt.ion()
+        view['line'].set_data(steps, q_vals)
+        view['line'].set_markevery(max(1, n // LIVE_MAX_MARKERS))
+        view['fill'].set_verts([_fill_verts(steps, q_vals)])
 
-        all_arms = self.env.channels
-        
-        # --- FIX: INITIALIZE THE DICTIONARIES IF THEY DON'T EXIST ---
-        if not hasattr(self, 'individual_figs'):
-            self.individual_figs = {}
-        if not hasattr(self, 'individual_axes'):
-            self.individual_axes = {}
+        final = view['final']
+        final.xy = (steps[-1], q_vals[-1])
+        final.set_text(f"{'Final' if n > 1 else 'Initial'}: {q_vals[-1]:.2f}")
+        final.set_visible(True)
 
-        # --- TRACKING THE LEARNING CURVE ---
-        if not hasattr(self, 'q_value_history_per_arm'):
-            self.q_value_history_per_arm = {arm: [] for arm in all_arms}
-            self.step_history_per_arm = {arm: [] for arm in all_arms}
-
-        if len(self.actions) > 0:
-            last_action = self.actions[-1]
-            current_estimates = self.agent.get_estimated_values()
-            action_idx = all_arms.index(last_action)
-            
-            # Capture the actual estimate at this specific moment
-            self.q_value_history_per_arm[last_action].append(current_estimates[action_idx])
-            self.step_history_per_arm[last_action].append(len(self.actions))
+        # --- THE "ZOOM" FIX ---
+        # We ignore the first few points if they are outliers (the 300+ values)
+        # to focus on the stabilized values (the 15-40 range)
+        focus_data = q_vals[int(n * 0.2):] if n > 5 else q_vals
+
+        moved = _grow_xlim(view['ax'], steps[-1])
+        moved |= _fit_ylim(view['ax'], focus_data.min(), focus_data.max())
+        return moved
 
-        colors = plt.cm.get_cmap('Dark2', len(all_arms)) 
+    def _arm_view_artists(self, view):
+        return [view['line'], view['fill'], view['final'], view['placeholder']]
+
+    def update_live_arm_plots(self, iteration):
+        import matplotlib.pyplot as plt
+
+        all_arms = self._arm_labels()
+        self._record_arm_history(all_arms)
+
+        if self.arm_fig is None:
+            n_arms = len(all_arms)
+            colors = plt.cm.get_cmap('Dark2', n_arms)
+            plt.ion()
+            with plt.style.context('ggplot'):
+                # Increase height significantly to prevent squashing
+                self.arm_fig, axs = plt.subplots(n_arms, 1, figsize=(12, 5 * n_arms))
+                self.arm_axes = axs if n_arms > 1 else [axs]
+                self.arm_fig.suptitle("Live Agent Q-Value Estimates", fontsize=20, fontweight='bold')
+                self.arm_views = [
+                    self._init_arm_view(ax, all_arms[idx], colors(idx))
+                    for idx, ax in enumerate(self.arm_axes)
+                ]
+                self.arm_axes[-1].set_xlabel("Iterations")
+                self.arm_fig.tight_layout(rect=[0, 0, 1, 0.95])
+
+            self.arm_blit = BlitManager(
+                self.arm_fig,
+                [artist for view in self.arm_views for artist in self._arm_view_artists(view)]
+            )
+
+        full_redraw = False
+        for idx, view in enumerate(self.arm_views):
+            arm_identity = all_arms[idx]
+            full_redraw |= self._update_arm_view(
+                view,
+                self.arm_history[arm_identity].column("step"),
+                self.arm_history[arm_identity].column("q_value")
+            )
+
+        self.arm_blit.update(full_redraw)
+
+
+    def update_live_arm_plots_for_each(self, iteration):
+        import matplotlib.pyplot as plt
+
+        all_arms = self._arm_labels()
+        self._record_arm_history(all_arms)
+
+        colors = plt.cm.get_cmap('Dark2', len(all_arms))
 
         for idx, arm_identity in enumerate(all_arms):
             # Create a separate window for this arm if it doesn't exist
             if arm_identity not in self.individual_figs:
-                # Each call here creates a brand new independent window
-                fig, ax = plt.subplots(figsize=(10, 6))
-                fig.canvas.manager.set_window_title(f"Channel {arm_identity} - Live Estimate")
+                plt.ion()
+                with plt.style.context('ggplot'):
+                    # Each call here creates a brand new independent window
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    fig.canvas.manager.set_window_title(f"Channel {arm_identity} - Live Estimate")
+                    view = self._init_arm_view(ax, arm_identity, colors(idx))
+                    ax.set_xlabel("Iterations")
                 self.individual_figs[arm_identity] = fig
                 self.individual_axes[arm_identity] = ax
+                self.individual_views[arm_identity] = view
+                self.individual_blits[arm_identity] = BlitManager(fig, self._arm_view_artists(view))
 
-            ax = self.individual_axes[arm_identity]
-            fig = self.individual_figs[arm_identity]
-            
-            steps = self.step_history_per_arm[arm_identity]
-            q_vals = self.q_value_history_per_arm[arm_identity]
-
-            ax.clear()
-            
-            if len(steps) > 1:
-                color = colors(idx)
-                ax.plot(steps, q_vals, color=color, linewidth=3, marker='o', markersize=6)
-                ax.fill_between(steps, q_vals, color=color, alpha=0.1)
-
-                # --- YOUR "ZOOM" FIX LOGIC ---
-                focus_data = q_vals[int(len(q_vals)*0.2):] if len(q_vals) > 5 else q_vals
-                v_min, v_max = min(focus_data), max(focus_data)
-                margin = (v_max - v_min) * 0.1 if v_max != v_min else 1.0
-                ax.set_ylim(v_min - margin, v_max + margin)
-
-                # Final value label
-                ax.annotate(f'Final: {q_vals[-1]:.2f}', xy=(steps[-1], q_vals[-1]), 
-                            xytext=(10, 0), textcoords='offset points',
-                            bbox=dict(boxstyle='round', fc='white', ec=color, alpha=0.8),
-                            fontweight='bold')
-            
-            elif len(steps) == 1:
-                ax.scatter(steps, q_vals, color=colors(idx), s=100)
-                ax.text(steps[0], q_vals[0], f'Initial: {q_vals[0]:.2f}')
-            else:
-                ax.text(0.5, 0.5, 'ARM NOT YET SAMPLED', ha='center', va='center', 
-                        transform=ax.transAxes, color='gray', fontsize=12)
+            full_redraw = self._update_arm_view(
+                self.individual_views[arm_identity],
+                self.arm_history[arm_identity].column("step"),
+                self.arm_history[arm_identity].column("q_value")
+            )
+            self.individual_blits[arm_identity].update(full_redraw)
+
+
+class BlitManager:
+
+    def __init__(self, fig, artists):
+        """
+        Keeps the static part of a live figure (axes, ticks, titles) cached and
+        redraws only the animated artists on top of it, as in the matplotlib
+        blitting tutorial. A full draw is only needed when the limits move.
+        """
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.artists = artists
+        self.background = None
+
+        for artist in artists:
+            artist.set_animated(True)
+        self.cid = self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def on_draw(self, event):
+        # Any full draw (ours or a window resize) refreshes the cached background
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def update(self, full_redraw=False):
+        if full_redraw or self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_animated()
+            self.canvas.blit(self.fig.bbox)
+        self.canvas.flush_events()
 
-            ax.set_title(f"Channel {arm_identity}", loc='left', fontsize=15, fontweight='bold')
-            ax.set_ylabel("Estimate")
-            ax.set_xlabel("Iterations")
-            ax.grid(True, linestyle=':', alpha=0.6)
 
-            fig.canvas.draw()
-            fig.canvas.flush_events()
+def _show_or_save(fig, save_path):
+    import matplotlib.pyplot as plt
 
-        # --- FREEZE AT 100 ---
-        plt.style.use('default')
+    # save_path renders the figure to a file instead (headless, e.g. with the Agg backend)
+    if save_path is None:
+        plt.show()
+    else:
+        fig.savefig(save_path)
+        plt.close(fig)
+
+
+def _fill_verts(x, y):
+    # Polygon of fill_between(x, y) down to 0, reused to update the fill in place
+    return np.column_stack([
+        np.concatenate([[x[0]], x, [x[-1]]]),
+        np.concatenate([[0], y, [0]]),
+    ])
+
+
+def _grow_xlim(ax, x_max):
+    """Double the x range when the data reaches its end; returns True if the limits moved."""
+    if x_max < ax.get_xlim()[1]:
+        return False
+    ax.set_xlim(0, max(10, 2 * x_max))
+    return True
+
+
+def _fit_ylim(ax, lo, hi, floor=None):
+    """Refit the y range only when the data leaves it or becomes much narrower than it."""
+    margin = (hi - lo) * 0.1 if hi != lo else 1.0
+    new_lo = lo - margin if floor is None else floor
+    new_hi = hi + margin
+    cur_lo, cur_hi = ax.get_ylim()
+    if lo >= cur_lo and hi <= cur_hi and (new_hi - new_lo) > 0.5 * (cur_hi - cur_lo):
+        return False
+    ax.set_ylim(new_lo, new_hi)
+    return True
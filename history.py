@@ -0,0 +1,67 @@
+import numpy as np
+
+
+class History:
+
+    def __init__(self, dtypes, capacity=1024, max_len=None):
+        """
+        Preallocated columnar history of fixed-size numpy rows.
+
+        Args:
+            dtypes: {column name: numpy dtype}.
+            capacity: Rows allocated up front, doubled whenever they run out.
+            max_len: Ring-buffer mode: keep only the last max_len rows and
+                overwrite the oldest one, so memory stays flat however long
+                the run (None = keep everything).
+        """
+        self.max_len = max_len
+        if max_len is not None:
+            capacity = max_len
+        self._capacity = capacity
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self._start = 0   # slot of the oldest row, only moves in ring mode
+        self._len = 0
+        self.total = 0    # rows ever appended, including overwritten ones
+
+    def __len__(self):
+        return self._len
+
+    def append(self, **values):
+        if self._len < self._capacity:
+            slot = (self._start + self._len) % self._capacity
+            self._len += 1
+        elif self.max_len is not None:
+            slot = self._start
+            self._start = (self._start + 1) % self._capacity
+        else:
+            self._grow()
+            slot = self._len
+            self._len += 1
+
+        for name, column in self._columns.items():
+            column[slot] = values[name]
+        self.total += 1
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(self._capacity, dtype=column.dtype)
+            grown[:self._len] = column[:self._len]
+            self._columns[name] = grown
+
+    def column(self, name):
+        """
+        The stored values of a column, oldest first. A view while the ring has
+        not wrapped (so use it before appending more), a copy afterwards.
+        """
+        column = self._columns[name]
+        if self._start == 0:
+            return column[:self._len]
+        return np.concatenate((column[self._start:], column[:self._start]))
+
+    def last(self, name):
+        return self._columns[name][(self._start + self._len - 1) % self._capacity]
+
+    def positions(self):
+        """0-based position in the whole run of each stored row."""
+        return np.arange(self.total - self._len, self.total)
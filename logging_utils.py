@@ -1,24 +1,127 @@
+import atexit
 import csv
 import os
+import time
+import weakref
 from datetime import datetime
 
+
+# writers that still have to be flushed when the interpreter exits. Only weak
+# references: a writer nobody uses any more is closed (and its file handle
+# released) when it is garbage collected, not kept open until exit.
+_open_writers = weakref.WeakSet()
+
+
+def close_at_exit(writer):
+    """Have writer.close() called at interpreter exit, unless it is closed or collected before."""
+    _open_writers.add(writer)
+
+
+@atexit.register
+def _close_open_writers():
+    for writer in list(_open_writers):
+        writer.close()
+
+
+class BufferedCsvWriter:
+
+    def __init__(self, filename, headers, mode="w", flush_every=100, flush_interval=5.0, fsync=False):
+        """
+        CSV writer that keeps its file open and buffers rows in memory.
+
+        Args:
+            filename: Path of the CSV file.
+            headers: Header row, written when the file is new or truncated.
+            mode: "w" to start a new file, "a" to append to an existing one.
+            flush_every: Flush once this many rows are buffered.
+            flush_interval: Flush when this many seconds passed since the last flush
+                (checked on each write, so None disables it).
+            fsync: Also fsync the file on every flush (survives a machine crash, slower).
+        """
+        write_header = mode == "w" or not os.path.isfile(filename) or os.path.getsize(filename) == 0
+
+        self.filename = filename
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self._file = open(filename, mode, newline="")
+        self._writer = csv.writer(self._file)
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+        if write_header:
+            self._writer.writerow(headers)
+            self.flush()
+
+        # make sure buffered rows reach the disk even if nobody calls close()
+        close_at_exit(self)
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def writerow(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+        elif self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._file.closed:
+            return
+        if self._buffer:
+            self._writer.writerows(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        _open_writers.discard(self)
+
+    def __del__(self):
+        # dropped without close(): write the buffered rows and release the file
+        if getattr(self, "_file", None) is not None:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# save_to_csv keeps one open writer per file instead of reopening it on every call
+_csv_writers = {}
+
+
 def save_to_csv(rows, filename="experiment.csv"):
     # Put Iteration first
     headers = ["Iteration", "Channel", "Reward", "Timestamp"]
-    
-    file_exists = os.path.isfile(filename)
-
-    with open(filename, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        
-        if not file_exists:
-            writer.writeheader()
-
-        for row in rows:
-            # Convert UNIX timestamp to readable date if needed
-            ts = row.get("Timestamp")
-            if isinstance(ts, (int, float)):  # UNIX seconds
-                row["Timestamp"] = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
-            # Otherwise if it's a string, we leave it as-is
-
-            writer.writerow(row)
+
+    writer = _csv_writers.get(filename)
+    if writer is None or writer.closed:
+        writer = BufferedCsvWriter(filename, headers, mode="a")
+        _csv_writers[filename] = writer
+
+    for row in rows:
+        # Convert UNIX timestamp to readable date if needed
+        ts = row.get("Timestamp")
+        if isinstance(ts, (int, float)):  # UNIX seconds
+            row["Timestamp"] = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+        # Otherwise if it's a string, we leave it as-is
+
+        # same check as csv.DictWriter (extrasaction="raise"): a row with keys
+        # the header does not have (e.g. "Device" of route rows) is an error,
+        # not an empty column
+        extras = [key for key in row if key not in headers]
+        if extras:
+            raise ValueError("dict contains fields not in fieldnames: " + ", ".join(repr(key) for key in extras))
+        writer.writerow([row.get(h, "") for h in headers])
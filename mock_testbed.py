@@ -0,0 +1,212 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+# Local stand-in for the testbed's /network/data-transfer-rate endpoint.
+#
+# Accepts the same {source, destination, path, wireless_channel} payload as
+# WirelessChannelEnv/WirelessRouteEnv and answers {"rate_mbps": ...}. The
+# throughput of every channel/route, the response latency, the HTTP error
+# rate and the rate of null answers come from a load profile, so client code
+# can be load-tested and production failure modes reproduced offline.
+#
+#   python mock_testbed.py --profile flaky --port 8000
+#   python mock_testbed.py --config my_profile.json
+
+
+ENDPOINT = "/network/data-transfer-rate"
+
+# A profile is a dict:
+#   channels:   {channel: distribution}   used when "path" is empty
+#   routes:     {relay ip: distribution}  used when "path" names a relay
+#   default:    distribution for anything not listed
+#   latency:    {"mean": s, "std": s}     response delay (clipped at 0)
+#   error_rate: fraction of requests answered with HTTP 500
+#   null_rate:  fraction of requests answered with {"rate_mbps": null}
+#
+# A distribution is {"dist": "normal", "mean", "std"}, {"dist": "rayleigh",
+# "scale", "offset"} or {"dist": "constant", "value"}, optionally with
+# "min"/"max" clipping (same shapes as the simulated reward machines).
+PROFILES = {
+    "ideal": {
+        "channels": {
+            "2": {"dist": "normal", "mean": 18, "std": 3, "min": 5, "max": 40},
+            "3": {"dist": "normal", "mean": 22, "std": 3, "min": 5, "max": 40},
+            "4": {"dist": "normal", "mean": 20, "std": 3, "min": 5, "max": 40},
+            "11": {"dist": "normal", "mean": 28, "std": 3, "min": 5, "max": 40},
+        },
+        "routes": {
+            "192.168.2.10": {"dist": "normal", "mean": 15, "std": 2, "min": 5, "max": 40},
+            "192.168.2.40": {"dist": "normal", "mean": 25, "std": 2, "min": 5, "max": 40},
+            "192.168.2.50": {"dist": "normal", "mean": 20, "std": 2, "min": 5, "max": 40},
+        },
+        "default": {"dist": "normal", "mean": 22.5, "std": 5, "min": 5, "max": 40},
+        "latency": {"mean": 0.0, "std": 0.0},
+        "error_rate": 0.0,
+        "null_rate": 0.0,
+    },
+    "busy": {
+        "default": {"dist": "rayleigh", "scale": 5.0, "offset": 5, "min": 5, "max": 40},
+        "latency": {"mean": 1.5, "std": 0.5},
+        "error_rate": 0.02,
+        "null_rate": 0.02,
+    },
+    "flaky": {
+        "default": {"dist": "normal", "mean": 22.5, "std": 5, "min": 5, "max": 40},
+        "latency": {"mean": 0.3, "std": 0.2},
+        "error_rate": 0.2,
+        "null_rate": 0.1,
+    },
+}
+
+
+def sample(distribution, rng):
+    """Draw one throughput value from a distribution spec."""
+    kind = distribution.get("dist", "constant")
+    if kind == "normal":
+        value = rng.normal(distribution["mean"], distribution["std"])
+    elif kind == "rayleigh":
+        value = rng.rayleigh(distribution["scale"]) + distribution.get("offset", 0)
+    elif kind == "constant":
+        value = distribution["value"]
+    else:
+        raise ValueError(f"unknown distribution {kind!r}")
+    return float(np.clip(value, distribution.get("min", -np.inf), distribution.get("max", np.inf)))
+
+
+class MockTestbed:
+
+    def __init__(self, profile="ideal", host="127.0.0.1", port=0, seed=None):
+        """
+        The stand-in server. `profile` is a name from PROFILES or a profile dict;
+        port=0 picks a free port (see .url).
+        """
+        if isinstance(profile, str):
+            profile = PROFILES[profile]
+        self.profile = profile
+        self.rng = np.random.default_rng(seed)
+        self._rng_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{ENDPOINT}"
+
+    def respond(self, payload):
+        """
+        Decide the answer to one request: returns (status, body dict or None, delay).
+        """
+        profile = self.profile
+        path = payload.get("path") or []
+
+        if path:
+            distribution = profile.get("routes", {}).get(str(path[0]))
+        else:
+            distribution = profile.get("channels", {}).get(str(payload.get("wireless_channel")))
+        if distribution is None:
+            distribution = profile.get("default", {"dist": "constant", "value": 10})
+
+        latency = profile.get("latency", {})
+        with self._rng_lock:
+            delay = max(0.0, self.rng.normal(latency.get("mean", 0.0), latency.get("std", 0.0)))
+            draw = self.rng.random()
+            rate = sample(distribution, self.rng)
+
+        error_rate = profile.get("error_rate", 0.0)
+        if draw < error_rate:
+            return 500, {"detail": "testbed measurement failed"}, delay
+        if draw < error_rate + profile.get("null_rate", 0.0):
+            return 200, {"rate_mbps": None}, delay
+        return 200, {"rate_mbps": rate}, delay
+
+    def start(self):
+        """Serve in a background thread (for tests and load runs)."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def _make_handler(testbed):
+
+    class Handler(BaseHTTPRequestHandler):
+        # keep-alive like the real service; buffer writes so headers and body
+        # leave in one packet (otherwise Nagle + delayed ACK add ~40 ms)
+        protocol_version = "HTTP/1.1"
+        wbufsize = -1
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length)
+
+            if self.path != ENDPOINT:
+                self._reply(404, {"detail": "not found"})
+                return
+            try:
+                payload = json.loads(raw)
+            except ValueError:
+                self._reply(422, {"detail": "invalid JSON"})
+                return
+
+            status, body, delay = testbed.respond(payload)
+            if delay:
+                time.sleep(delay)
+            self._reply(status, body)
+
+        def _reply(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the testbed data-transfer-rate endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--profile", default="ideal", choices=sorted(PROFILES), help="built-in load profile")
+    parser.add_argument("--config", help="JSON file with a profile, overrides --profile")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    profile = args.profile
+    if args.config:
+        with open(args.config) as f:
+            profile = json.load(f)
+
+    testbed = MockTestbed(profile, host=args.host, port=args.port, seed=args.seed)
+    print(f"Mock testbed ({args.config or args.profile}) listening on {testbed.url}")
+    try:
+        testbed.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        testbed.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
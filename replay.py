@@ -1,81 +1,272 @@
-import pandas as pd
+import argparse
 import json
+from pathlib import Path
+
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 
-# --- Load your experiment CSV ---
-df = pd.read_csv("experiments/optimal_channel_20260122_101440/steps.csv")
-df["q_values"] = df["q_values"].apply(json.loads)
-
-# -------- 1) CUMULATIVE AVERAGE --------
-rewards = df["reward"].values
-steps = np.arange(1, len(rewards) + 1)
-avg = np.cumsum(rewards) / steps
-
-plt.figure(figsize=(10,5))
-plt.plot(steps, avg, color="#E69F00", linewidth=2)
-
-# Add first and last iteration numbers above the curve
-plt.text(steps[0], avg[0]+0.05*(max(avg)-min(avg)), f"{avg[0]:.2f}", ha='center', fontsize=10)
-plt.text(steps[-1], avg[-1]+0.05*(max(avg)-min(avg)), f"{avg[-1]:.2f}", ha='center', fontsize=10)
-
-plt.xlabel("Iteration")
-plt.ylabel("Cumulative Average Reward")
-plt.title("Cumulative Average Reward Over Time")
-plt.grid(True, alpha=0.4)
-plt.show()
-
-# -------- 2) AVG REWARD PER DEVICE --------
-grouped = df.groupby("arm_label")["reward"].mean()
-
-plt.figure(figsize=(8,5))
-bars = plt.bar(grouped.index, grouped.values, color="#56B4E9")
-plt.xlabel("Device")
-plt.ylabel("Average Reward")
-plt.title("Average Reward per Device")
-plt.xticks(grouped.index)  # Only show the devices present
-plt.grid(axis='y', alpha=0.4)
-
-# Add the numbers on top of each bar
-for bar in bars:
-    height = bar.get_height()
-    plt.text(bar.get_x() + bar.get_width()/2., height + 0.02*max(grouped.values),
-             f'{height:.2f}', ha='center', va='bottom', fontsize=10)
-
-plt.show()
-
-# -------- 3) Q-VALUE PER DEVICE (ALL TOGETHER) --------
-devices = df["arm_label"].unique()
-
-plt.figure(figsize=(10,6))
-for device in devices:
-    device_df = df[df["arm_label"] == device]
-    steps = device_df["iteration"].values
-    q_vals = [row["q_values"][row["arm_index"]] for _, row in device_df.iterrows()]
-    plt.plot(steps, q_vals, label=f"Device {device}", linewidth=2)
-
-plt.xlabel("Iteration")
-plt.ylabel("Q-Value")
-plt.title("Q-Value Learning Curves (All Devices)")
-plt.legend()
-plt.grid(True, alpha=0.4)
-plt.show()
-
-# -------- 4) Q-VALUE PER DEVICE (SEPARATE PLOTS, NUMBERS ONLY) --------
-for device in devices:
-    device_df = df[df["arm_label"] == device]
-    steps = device_df["iteration"].values
-    q_vals = [row["q_values"][row["arm_index"]] for _, row in device_df.iterrows()]
+
+# Replays the plots of a finished experiment from its directory
+# (experiments/<name>/steps.csv, or the binary log in steps_bin/ when present).
+#
+# The log is read in chunks: every chunk updates running aggregates and
+# bounded, decimated curves, so a multi-GB run is analysed in bounded memory.
+#
+#   python replay.py experiments/optimal_channel_20260122_101440
+
+
+class SeriesDecimator:
+
+    def __init__(self, max_points):
+        """
+        Keeps at most ~max_points samples of a growing (x, y) series.
+        When the budget is exceeded every other sample is dropped and the
+        stride doubles; the last sample is always kept.
+        """
+        self.max_points = max_points
+        self.stride = 1
+        self.n_seen = 0
+        self._idx = []
+        self._x = []
+        self._y = []
+        self._n_kept = 0
+        self.last = None
+
+    def extend(self, x, y):
+        if len(x) == 0:
+            return
+        idx = np.arange(self.n_seen, self.n_seen + len(x))
+        keep = idx % self.stride == 0
+        self._idx.append(idx[keep])
+        self._x.append(np.asarray(x)[keep])
+        self._y.append(np.asarray(y)[keep])
+        self._n_kept += int(keep.sum())
+        self.n_seen += len(x)
+        self.last = (x[-1], y[-1])
+
+        while self._n_kept > self.max_points:
+            self._compact()
+
+    def _compact(self):
+        idx, x, y = (np.concatenate(parts) for parts in (self._idx, self._x, self._y))
+        self.stride *= 2
+        keep = idx % self.stride == 0
+        self._idx, self._x, self._y = [idx[keep]], [x[keep]], [y[keep]]
+        self._n_kept = int(keep.sum())
+
+    def values(self):
+        if self.last is None:
+            return np.empty(0), np.empty(0)
+        x = np.concatenate(self._x)
+        y = np.concatenate(self._y)
+        if x[-1] != self.last[0]:
+            x = np.append(x, self.last[0])
+            y = np.append(y, self.last[1])
+        return x, y
+
+
+def _parse_q_values(column):
+    # One json.loads per chunk instead of one per row
+    return np.array(json.loads("[" + ",".join(column) + "]"), dtype=float)
+
+
+def iter_step_chunks(exp_dir, chunksize=100_000):
+    """
+    Yield the steps of an experiment in chunks of at most `chunksize` rows.
+
+    Each chunk is a dict of arrays: iteration, arm_index, reward,
+    q_values (rows x arms) and arm_label.
+    """
+    exp_dir = Path(exp_dir)
+    binary_dir = exp_dir / "steps_bin"
+
+    if (binary_dir / "meta.json").exists():
+        from step_store import load_steps
+
+        steps = load_steps(binary_dir)
+        labels = steps["arm_labels"]
+        label_lookup = np.empty(max(labels, default=-1) + 1, dtype=object)
+        for idx, label in labels.items():
+            label_lookup[idx] = label
+        for start in range(0, len(steps["iteration"]), chunksize):
+            stop = start + chunksize
+            arm_index = np.asarray(steps["arm_index"][start:stop])
+            yield {
+                "iteration": np.asarray(steps["iteration"][start:stop]),
+                "arm_index": arm_index,
+                "reward": np.asarray(steps["reward"][start:stop]),
+                "q_values": np.asarray(steps["q_values"][start:stop]),
+                "arm_label": label_lookup[arm_index],
+            }
+        return
+
+    reader = pd.read_csv(
+        exp_dir / "steps.csv",
+        usecols=["iteration", "arm_index", "arm_label", "reward", "q_values"],
+        chunksize=chunksize,
+    )
+    for df in reader:
+        yield {
+            "iteration": df["iteration"].to_numpy(),
+            "arm_index": df["arm_index"].to_numpy(),
+            "reward": df["reward"].to_numpy(dtype=float),
+            "q_values": _parse_q_values(df["q_values"]),
+            "arm_label": df["arm_label"].to_numpy(),
+        }
+
+
+def summarize(exp_dir, chunksize=100_000, max_points=5000):
+    """
+    Stream an experiment log once and collect everything the plots need.
+    """
+    avg_curve = SeriesDecimator(max_points)
+    q_curves = {}       # arm index -> decimated Q-value curve of that arm
+    arm_avg_curves = {} # arm index -> decimated running average reward of that arm
+    labels = {}
+    reward_sums = {}
+    reward_counts = {}
+    total_reward = 0.0
+    n_steps = 0
+
+    for chunk in iter_step_chunks(exp_dir, chunksize):
+        rewards = chunk["reward"]
+        arm_index = chunk["arm_index"]
+        n = len(rewards)
+
+        # -------- running cumulative average --------
+        cumulative = total_reward + np.cumsum(rewards)
+        steps = np.arange(n_steps + 1, n_steps + n + 1)
+        avg_curve.extend(steps, cumulative / steps)
+        total_reward = cumulative[-1]
+        n_steps += n
+
+        # -------- Q-value of the chosen arm at each step --------
+        chosen_q = chunk["q_values"][np.arange(n), arm_index]
+
+        for arm in np.unique(arm_index):
+            mask = arm_index == arm
+            arm = int(arm)
+            if arm not in q_curves:
+                q_curves[arm] = SeriesDecimator(max_points)
+                arm_avg_curves[arm] = SeriesDecimator(max_points)
+                labels[arm] = chunk["arm_label"][np.argmax(mask)]
+                reward_sums[arm] = 0.0
+                reward_counts[arm] = 0
+            q_curves[arm].extend(chunk["iteration"][mask], chosen_q[mask])
+
+            arm_cumulative = reward_sums[arm] + np.cumsum(rewards[mask])
+            arm_counts = reward_counts[arm] + np.arange(1, int(mask.sum()) + 1)
+            arm_avg_curves[arm].extend(steps[mask], arm_cumulative / arm_counts)
+            reward_sums[arm] = arm_cumulative[-1]
+            reward_counts[arm] = int(arm_counts[-1])
+
+    if n_steps == 0:
+        raise ValueError(f"No steps logged in {exp_dir}")
+
+    arms = sorted(q_curves)
+    return {
+        "n_steps": n_steps,
+        "avg_curve": avg_curve.values(),
+        "arms": arms,
+        "labels": labels,
+        "avg_reward_per_arm": {arm: reward_sums[arm] / reward_counts[arm] for arm in arms},
+        "count_per_arm": {arm: reward_counts[arm] for arm in arms},
+        "arm_avg_curves": {arm: arm_avg_curves[arm].values() for arm in arms},
+        "q_curves": {arm: q_curves[arm].values() for arm in arms},
+    }
+
+
+def _finish(out_dir, name):
+    # interactive window, or a file in out_dir for headless reports
+    if out_dir is None:
+        plt.show()
+    else:
+        plt.savefig(Path(out_dir) / f"{name}.png", dpi=100)
+        plt.close()
+
+
+def plot_summary(summary, out_dir=None):
+    """Draw the replay figures; with out_dir they are saved there as PNGs instead of shown."""
+    labels = summary["labels"]
+    arms = summary["arms"]
+
+    # -------- 1) CUMULATIVE AVERAGE --------
+    steps, avg = summary["avg_curve"]
+
+    plt.figure(figsize=(10,5))
+    plt.plot(steps, avg, color="#E69F00", linewidth=2)
+
+    # Add first and last iteration numbers above the curve
+    plt.text(steps[0], avg[0]+0.05*(max(avg)-min(avg)), f"{avg[0]:.2f}", ha='center', fontsize=10)
+    plt.text(steps[-1], avg[-1]+0.05*(max(avg)-min(avg)), f"{avg[-1]:.2f}", ha='center', fontsize=10)
+
+    plt.xlabel("Iteration")
+    plt.ylabel("Cumulative Average Reward")
+    plt.title("Cumulative Average Reward Over Time")
+    plt.grid(True, alpha=0.4)
+    _finish(out_dir, "cumulative_average")
+
+    # -------- 2) AVG REWARD PER DEVICE --------
+    names = [str(labels[arm]) for arm in arms]
+    values = [summary["avg_reward_per_arm"][arm] for arm in arms]
 
     plt.figure(figsize=(8,5))
-    plt.plot(steps, q_vals, color="#009E73", linewidth=2)
-    
-    # Add numbers at first and last points only (no bullets)
-    plt.text(steps[0], q_vals[0]+0.02*(max(q_vals)-min(q_vals)), f"{q_vals[0]:.2f}", ha='center', fontsize=10)
-    plt.text(steps[-1], q_vals[-1]+0.02*(max(q_vals)-min(q_vals)), f"{q_vals[-1]:.2f}", ha='center', fontsize=10)
+    bars = plt.bar(names, values, color="#56B4E9")
+    plt.xlabel("Device")
+    plt.ylabel("Average Reward")
+    plt.title("Average Reward per Device")
+    plt.grid(axis='y', alpha=0.4)
+
+    # Add the numbers on top of each bar
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height + 0.02*max(values),
+                 f'{height:.2f}', ha='center', va='bottom', fontsize=10)
+
+    _finish(out_dir, "avg_reward_per_arm")
+
+    # -------- 3) Q-VALUE PER DEVICE (ALL TOGETHER) --------
+    plt.figure(figsize=(10,6))
+    for arm in arms:
+        steps, q_vals = summary["q_curves"][arm]
+        plt.plot(steps, q_vals, label=f"Device {labels[arm]}", linewidth=2)
 
     plt.xlabel("Iteration")
     plt.ylabel("Q-Value")
-    plt.title(f"Q-Value Learning Curve: Device {device}")
+    plt.title("Q-Value Learning Curves (All Devices)")
+    plt.legend()
     plt.grid(True, alpha=0.4)
-    plt.show()
+    _finish(out_dir, "q_values")
+
+    # -------- 4) Q-VALUE PER DEVICE (SEPARATE PLOTS, NUMBERS ONLY) --------
+    for arm in arms:
+        steps, q_vals = summary["q_curves"][arm]
+
+        plt.figure(figsize=(8,5))
+        plt.plot(steps, q_vals, color="#009E73", linewidth=2)
+
+        # Add numbers at first and last points only (no bullets)
+        plt.text(steps[0], q_vals[0]+0.02*(max(q_vals)-min(q_vals)), f"{q_vals[0]:.2f}", ha='center', fontsize=10)
+        plt.text(steps[-1], q_vals[-1]+0.02*(max(q_vals)-min(q_vals)), f"{q_vals[-1]:.2f}", ha='center', fontsize=10)
+
+        plt.xlabel("Iteration")
+        plt.ylabel("Q-Value")
+        plt.title(f"Q-Value Learning Curve: Device {labels[arm]}")
+        plt.grid(True, alpha=0.4)
+        _finish(out_dir, f"q_values_{labels[arm]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the plots of a logged experiment.")
+    parser.add_argument("experiment_dir", help="experiment directory, e.g. experiments/optimal_channel_20260122_101440")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows read per chunk")
+    parser.add_argument("--max-points", type=int, default=5000, help="max points kept per curve")
+    args = parser.parse_args()
+
+    summary = summarize(args.experiment_dir, chunksize=args.chunksize, max_points=args.max_points)
+    plot_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from replay import plot_summary, summarize
+
+
+# Headless batch reports: every experiment directory is streamed once
+# (replay.summarize), its curves are downsampled with largest-triangle-three-
+# buckets to a fixed point budget and all figures are written as PNGs with the
+# Agg backend, one process per experiment:
+#
+#   python report.py experiments/*/ --out reports --points 2000
+#
+# reports/<experiment>/ gets the final-results figure (Experiment.plot), the
+# per-arm running averages (plot_avg_reward_per_arm_over_time) and the
+# replay.py figures; reports/index.csv lists one line per experiment.
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-triangle-three-buckets: n_out points of (x, y) that keep the
+    visual shape of the curve (peaks and dips survive, unlike striding).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # first and last points are always kept, the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    a = 0
+    for k in range(n_out - 2):
+        lo, hi = edges[k], edges[k + 1]
+        if k + 2 < len(edges):
+            next_lo, next_hi = edges[k + 1], edges[k + 2]
+            cx, cy = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        # the point of this bucket spanning the largest triangle with the
+        # previously kept point and the average of the next bucket
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[k + 1] = a
+
+    return x[keep], y[keep]
+
+
+def downsample_summary(summary, points):
+    summary = dict(summary)
+    summary["avg_curve"] = lttb(*summary["avg_curve"], points)
+    for key in ("q_curves", "arm_avg_curves"):
+        summary[key] = {arm: lttb(*curve, points) for arm, curve in summary[key].items()}
+    return summary
+
+
+def plot_results(summary, exptype, path):
+    """Layout of Experiment.plot: cumulative average and sorted per-arm average."""
+    if exptype == 'optimal_route':
+        entity_singular = "Route"
+        main_title = "Epsilon-Greedy Optimal Route Selection: Final Results"
+    else:
+        entity_singular = "Channel"
+        main_title = "Epsilon-Greedy Wireless Channel Selection: Final Results"
+
+    with plt.style.context('ggplot'):
+        fig, axs = plt.subplots(2, 1, figsize=(12, 10))
+        fig.suptitle(main_title, fontsize=18, fontweight='bold', color='#444444')
+
+        steps, avg_reward = summary["avg_curve"]
+        axs[0].plot(steps, avg_reward, color='#E69F00', linewidth=3)
+        axs[0].set_title("Average Reward vs Steps (Iterations)", loc='left', fontsize=14, fontweight='bold')
+        axs[0].set_xlabel("Step (Iteration)", fontsize=12)
+        axs[0].set_ylabel("Cumulative Average Reward", fontsize=12)
+        axs[0].text(steps[-1], avg_reward[-1], f'Final: {avg_reward[-1]:.2f}',
+                    color='black', fontsize=11, ha='right', va='bottom', fontweight='bold')
+
+        sorted_data = sorted(((summary["avg_reward_per_arm"][arm], str(summary["labels"][arm]))
+                              for arm in summary["arms"]), reverse=True)
+        bars = axs[1].bar([d[1] for d in sorted_data], [d[0] for d in sorted_data], color='#56B4E9')
+        axs[1].set_title(f"Average Reward per {entity_singular} (Arm)", loc='left', fontsize=14, fontweight='bold')
+        axs[1].set_xlabel(f"{entity_singular} (Arm)", fontsize=12)
+        axs[1].set_ylabel("Average Reward", fontsize=12)
+        for bar in bars:
+            height = bar.get_height()
+            axs[1].text(bar.get_x() + bar.get_width() / 2., height + 0.5, f'{height:.2f}',
+                        ha='center', va='bottom', fontsize=10)
+
+        for ax in axs:
+            ax.spines['right'].set_visible(False)
+            ax.spines['top'].set_visible(False)
+
+        fig.tight_layout(rect=[0, 0, 1, 0.96])
+        fig.savefig(path)
+        plt.close(fig)
+
+
+def plot_arm_averages(summary, path):
+    """Layout of Experiment.plot_avg_reward_per_arm_over_time: one panel per arm."""
+    arms = summary["arms"]
+    colors = plt.cm.get_cmap('Dark2', len(arms))
+
+    with plt.style.context('ggplot'):
+        fig, axs = plt.subplots(len(arms), 1, figsize=(12, 5 * len(arms)), sharex=True, squeeze=False)
+        fig.suptitle("Average Reward per Arm Over Time: Individual Performance",
+                     fontsize=18, fontweight='bold', color='#444444')
+
+        for idx, arm in enumerate(arms):
+            ax = axs[idx, 0]
+            steps, arm_avg = summary["arm_avg_curves"][arm]
+            ax.plot(steps, arm_avg, color=colors(idx), linewidth=3)
+            ax.fill_between(steps, arm_avg, color=colors(idx), alpha=0.15)
+            ax.set_title(f"Arm {summary['labels'][arm]} (Selections: {summary['count_per_arm'][arm]})",
+                         loc='left', fontsize=14, fontweight='bold')
+            ax.set_ylabel("Avg Reward", fontsize=12)
+            ax.text(steps[-1], arm_avg[-1], f'{arm_avg[-1]:.2f}', color='black', fontsize=10, ha='right',
+                    fontweight='bold')
+            ax.spines['right'].set_visible(False)
+            ax.spines['top'].set_visible(False)
+
+        axs[-1, 0].set_xlabel("Step (Iteration)", fontsize=14)
+        fig.tight_layout(rect=[0, 0, 1, 0.96])
+        fig.savefig(path)
+        plt.close(fig)
+
+
+def report_one(exp_dir, out_root, points, max_points, chunksize):
+    """Worker: all figures of one experiment directory. Returns its index.csv row."""
+    exp_dir = Path(exp_dir)
+    summary = downsample_summary(summarize(exp_dir, chunksize=chunksize, max_points=max_points), points)
+
+    out_dir = Path(out_root) / exp_dir.name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    exptype = "optimal_route" if exp_dir.name.startswith("optimal_route") else "optimal_channel"
+
+    plot_results(summary, exptype, out_dir / "results.png")
+    plot_arm_averages(summary, out_dir / "arm_avg_over_time.png")
+    plot_summary(summary, out_dir=out_dir)
+
+    best = max(summary["arms"], key=lambda arm: summary["avg_reward_per_arm"][arm])
+    return {
+        "experiment": exp_dir.name,
+        "n_steps": summary["n_steps"],
+        "final_avg_reward": float(summary["avg_curve"][1][-1]),
+        "best_arm": summary["labels"][best],
+        "best_arm_avg_reward": summary["avg_reward_per_arm"][best],
+        "report": str(out_dir),
+    }
+
+
+def run_reports(exp_dirs, out_root="reports", points=2000, max_points=50_000, chunksize=100_000, workers=None):
+    """Render every experiment on a process pool and write <out_root>/index.csv."""
+    out_root = Path(out_root)
+    out_root.mkdir(parents=True, exist_ok=True)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(report_one, exp_dir, out_root, points, max_points, chunksize): exp_dir
+            for exp_dir in exp_dirs
+        }
+        for future in as_completed(futures):
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                # one malformed experiment must not take the rest of the batch down
+                print(f"❌ {futures[future]}: {type(e).__name__}: {e}")
+                continue
+            print(f"✅ {rows[-1]['experiment']}")
+
+    rows.sort(key=lambda row: row["experiment"])
+    if rows:
+        with open(out_root / "index.csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the figures of many experiments to files.")
+    parser.add_argument("experiment_dirs", nargs="+", help="experiment directories (steps.csv or steps_bin/)")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--points", type=int, default=2000, help="points per curve after LTTB downsampling")
+    parser.add_argument("--max-points", type=int, default=50_000,
+                        help="points per curve kept while streaming the log (input of the downsampling)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows read per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    args = parser.parse_args()
+
+    exp_dirs = [d for d in args.experiment_dirs if Path(d).is_dir()]
+    rows = run_reports(exp_dirs, args.out, args.points, args.max_points, args.chunksize, args.workers)
+    print(f"{len(rows)}/{len(exp_dirs)} reports written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class MeasurementCache:
+
+    def __init__(self, ttl, max_entries=1024, policy="lru", max_reuses=None):
+        """
+        Cache of testbed measurements keyed by (source, destination, path, channel).
+
+        A measurement is served again while it is younger than `ttl` seconds,
+        i.e. within the coherence window of the channel, so repeated exploit
+        picks of the same channel do not each cost a full testbed probe.
+
+        Args:
+            ttl: Coherence window in seconds.
+            max_entries: Entries kept before evicting.
+            policy: "lru" evicts the least recently used entry, "fifo" the oldest measurement.
+            max_reuses: Sub-sampling: serve a measurement at most this many times
+                before probing again even inside the window (None = no limit).
+        """
+        if policy not in ("lru", "fifo"):
+            raise ValueError("policy must be 'lru' or 'fifo'")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.policy = policy
+        self.max_reuses = max_reuses
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> [measured_at, value, reuses]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request_data):
+        return (
+            request_data["source"],
+            request_data["destination"],
+            tuple(request_data["path"]),
+            request_data["wireless_channel"],
+        )
+
+    def get(self, key):
+        """The cached measurement for key, or None if it has to be probed."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[0] > self.ttl or (
+                    self.max_reuses is not None and entry[2] >= self.max_reuses):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            entry[2] += 1
+            if self.policy == "lru":
+                self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = [time.monotonic(), value, 0]
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+        }
@@ -1,22 +1,210 @@
-from agents import EpsilonGreedy
-from environments import WirelessChannelEnv, WirelessRouteEnv
-from experiment import Experiment
-from dotenv import load_dotenv
+import argparse
+import os
 
 
-source_ip ="192.168.2.80"
-dest_ip = "192.168.2.100"
-channels = [2,3,4,11] 
-devices = [10,40,50]
-agent = EpsilonGreedy(n_arms=len(channels), epsilon=0.25,update_rule= "exponential_smoothing", alpha = 0.5)
-envChannel = WirelessChannelEnv(source_ip,dest_ip,channels, "http://localhost:8000/network/data-transfer-rate",0)
-envRoute = WirelessRouteEnv(source_ip,dest_ip,devices, "http://localhost:8000/network/data-transfer-rate", 0, 165)
+# Command line entry point for a single experiment:
+#
+#   python run.py --mode channel --arms 2,3,4,11 --reward-machine 0 --trials 200 --live-plot
+#   python run.py --mode route --arms 10,40,50 --channel 165 --reward-machine 2 --trials 5000
+#
+# Only what a run needs is imported: a simulated run (reward machines 1-4)
+# without --live-plot/--plot never loads matplotlib, requests or dotenv.
+# For testbed runs (reward machine 0) a .env file is read first, so
+# REWARD_ENDPOINT, SOURCE_IP and DEST_IP can be set there.
 
-# Here we will put type of experiment. its either optimal channel experiment or optimal route. 
-exp = Experiment(agent, envChannel, 'optimal_channel')
-exp.run(200)
-#exp.plot()
-#exp.plot_avg_reward_per_arm_over_time()
+DEFAULT_ARMS = {"channel": "2,3,4,11", "route": "10,40,50"}
+DEFAULT_ENDPOINT = "http://localhost:8000/network/data-transfer-rate"
+# rewards of the simulated reward machines 1, 2 and 4 are clipped to 5-40 Mbps
+SIMULATED_REWARD_RANGE = (5.0, 40.0)
 
 
+def _arms(text):
+    # channels and route devices are numbers; a device is the last octet of its
+    # 192.168.2.x address (WirelessRouteEnv builds the full IP)
+    arms = [a.strip() for a in text.split(",") if a.strip()]
+    if not all(a.isdigit() for a in arms):
+        raise argparse.ArgumentTypeError(f"arms must be comma separated numbers, got {text!r}")
+    return [int(a) for a in arms]
 
+
+def _range(text):
+    try:
+        low, high = (float(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LOW,HIGH, got {text!r}") from None
+    return low, high
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run one multi-armed bandit experiment.")
+    parser.add_argument("--mode", choices=["channel", "route"], default="channel",
+                        help="optimal channel or optimal route (relay device) experiment")
+    parser.add_argument("--arms", type=_arms, default=None,
+                        help="comma separated channels, or devices as the last octet of 192.168.2.x "
+                             "(default: 2,3,4,11 / 10,40,50)")
+    parser.add_argument("--trials", type=int, default=200)
+
+    agent = parser.add_argument_group("agent")
+    agent.add_argument("--agent", default="epsilon_greedy",
+                       choices=["epsilon_greedy", "ucb1", "thompson", "discounted_ucb", "sliding_window_ucb"])
+    agent.add_argument("--epsilon", type=float, default=0.25)
+    agent.add_argument("--update-rule", default="exponential_smoothing",
+                       choices=["incremental", "exponential_smoothing"])
+    agent.add_argument("--alpha", type=float, default=0.5)
+    agent.add_argument("--c", type=float, default=10.0, help="UCB exploration scale in reward units")
+    agent.add_argument("--gamma", type=float, default=0.99, help="discount of discounted_ucb")
+    agent.add_argument("--window", type=int, default=100, help="window of sliding_window_ucb")
+    agent.add_argument("--prior-mean", type=float, default=22.5, help="thompson prior mean")
+    agent.add_argument("--prior-std", type=float, default=20.0, help="thompson prior std")
+    agent.add_argument("--noise-std", type=float, default=5.0, help="thompson measurement noise std")
+    agent.add_argument("--seed", type=int, default=None, help="seed numpy's global generator")
+
+    rewards = parser.add_argument_group("rewards")
+    rewards.add_argument("--reward-machine", type=int, default=0, choices=[0, 1, 2, 3, 4],
+                         help="0 = testbed over HTTP, 3 = recorded trace, 1/2/4 = simulated")
+    rewards.add_argument("--endpoint", default=None, help=f"reward endpoint (default: $REWARD_ENDPOINT or {DEFAULT_ENDPOINT})")
+    rewards.add_argument("--source-ip", default=None, help="default: $SOURCE_IP or 192.168.2.80")
+    rewards.add_argument("--dest-ip", default=None, help="default: $DEST_IP or 192.168.2.100")
+    rewards.add_argument("--channel", type=int, default=165, help="wireless channel of route experiments")
+    rewards.add_argument("--trace", default=None, help="trace file for reward machine 3 (see traces.py)")
+    rewards.add_argument("--rate-limit", type=float, default=0.5,
+                         help="testbed requests per second (0 = no pacing)")
+    rewards.add_argument("--record", default=None, help="append the testbed traffic to this JSONL session log")
+    rewards.add_argument("--replay", default=None, help="serve testbed responses from this recorded session log")
+
+    run = parser.add_argument_group("run")
+    run.add_argument("--name", default=None, help="experiment directory name (default: <exptype>_<timestamp>)")
+    run.add_argument("--base-dir", default="experiments")
+    run.add_argument("--binary-log", action="store_true", help="also write the columnar binary step log")
+    run.add_argument("--pipeline-depth", type=int, default=1, help="probes kept in flight (1 = sequential)")
+    run.add_argument("--checkpoint-every", type=int, default=None, help="write a checkpoint every N steps")
+    run.add_argument("--resume", default=None, help="experiment directory to resume from its checkpoint")
+    run.add_argument("--no-timing", action="store_true", help="do not record per-step phase timings")
+    run.add_argument("--stop-confidence", type=float, default=None,
+                     help="end early once the best arm is identified at this confidence, e.g. 0.95")
+    run.add_argument("--stop-mode", choices=["stop", "exploit"], default="stop",
+                     help="after identification: end the run, or keep probing only the best arm")
+    run.add_argument("--stop-min-samples", type=int, default=5, help="pulls per arm before the stopping rule applies")
+    run.add_argument("--stop-noise-std", type=float, default=5.0,
+                     help="noise scale of single measurements assumed by the stopping rule (Mbps)")
+    run.add_argument("--stop-reward-range", type=_range, default=None, metavar="LOW,HIGH",
+                     help="range rewards are clipped to for the stopping rule; required for reward "
+                          "machines 0 and 3 (simulated machines use 5,40)")
+    run.add_argument("--stop-sampling", choices=["lucb", "agent"], default="lucb",
+                     help="who picks the arms until the best one is identified")
+
+    views = parser.add_argument_group("views")
+    views.add_argument("--live-plot", action="store_true", help="live matplotlib windows in the loop")
+    views.add_argument("--dashboard", default=None, metavar="PORT", type=int,
+                       help="publish every step to dashboard.py on this UDP port instead")
+    views.add_argument("--plot", action="store_true", help="show the final plots after the run")
+    views.add_argument("--verbose", action="store_true", help="print every step and agent update")
+    return parser
+
+
+def build_env(args, arms):
+    reward_trace = None
+    if args.reward_machine == 3:
+        if args.trace is None:
+            raise SystemExit("--reward-machine 3 needs --trace")
+        from traces import TraceRewards
+        reward_trace = TraceRewards(args.trace)
+
+    if args.reward_machine == 0:
+        from dotenv import load_dotenv
+        load_dotenv()
+
+        import environments
+        environments.configure_rate_limit(args.rate_limit or None)
+        if args.record or args.replay:
+            environments.configure_session_log(record=args.record, replay=args.replay)
+
+    from environments import WirelessChannelEnv, WirelessRouteEnv
+
+    endpoint = args.endpoint or os.environ.get("REWARD_ENDPOINT", DEFAULT_ENDPOINT)
+    source_ip = args.source_ip or os.environ.get("SOURCE_IP", "192.168.2.80")
+    dest_ip = args.dest_ip or os.environ.get("DEST_IP", "192.168.2.100")
+
+    if args.mode == "route":
+        return WirelessRouteEnv(source_ip, dest_ip, arms, endpoint, args.reward_machine, args.channel,
+                                reward_trace=reward_trace)
+    return WirelessChannelEnv(source_ip, dest_ip, arms, endpoint, args.reward_machine, reward_trace=reward_trace)
+
+
+def build_agent(args, n_arms):
+    from agents import AGENTS
+
+    params = {
+        "epsilon_greedy": {"epsilon": args.epsilon, "update_rule": args.update_rule, "alpha": args.alpha,
+                           "verbose": args.verbose},
+        "ucb1": {"c": args.c},
+        "thompson": {"prior_mean": args.prior_mean, "prior_std": args.prior_std, "noise_std": args.noise_std},
+        "discounted_ucb": {"gamma": args.gamma, "c": args.c},
+        "sliding_window_ucb": {"window": args.window, "c": args.c},
+    }
+    return AGENTS[args.agent](n_arms=n_arms, **params[args.agent])
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    from datetime import datetime
+
+    import numpy as np
+    from experiment import Experiment
+    from ExperimentLogger import ExperimentLogger
+
+    if args.seed is not None:
+        np.random.seed(args.seed)
+
+    arms = args.arms or _arms(DEFAULT_ARMS[args.mode])
+    exptype = "optimal_route" if args.mode == "route" else "optimal_channel"
+    agent = build_agent(args, len(arms))
+    env = build_env(args, arms)
+
+    stopping = None
+    if args.stop_confidence is not None:
+        from stopping import BestArmStopping
+        reward_range = args.stop_reward_range
+        if reward_range is None:
+            if args.reward_machine in (0, 3):
+                raise SystemExit("--stop-confidence with reward machine 0 or 3 needs --stop-reward-range LOW,HIGH")
+            reward_range = SIMULATED_REWARD_RANGE
+        stopping = BestArmStopping(args.stop_confidence, min_samples=args.stop_min_samples, mode=args.stop_mode,
+                                   noise_std=args.stop_noise_std, reward_range=reward_range,
+                                   sampling=args.stop_sampling)
+
+    publisher = None
+    if args.dashboard is not None:
+        from dashboard import StepPublisher
+        publisher = StepPublisher(port=args.dashboard)
+
+    if args.resume:
+        # without --stop-confidence the checkpoint's own stopping rule is kept
+        exp = Experiment.resume(agent, env, exptype, args.resume, live_plot=args.live_plot,
+                                timing=not args.no_timing, checkpoint_every=args.checkpoint_every,
+                                stopping=stopping, verbose=args.verbose)
+        exp.publisher = publisher
+    else:
+        name = args.name or f"{exptype}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        logger = ExperimentLogger(name, binary=args.binary_log, base_dir=args.base_dir)
+        exp = Experiment(agent, env, exptype, live_plot=args.live_plot, logger=logger, timing=not args.no_timing,
+                         checkpoint_every=args.checkpoint_every, publisher=publisher, stopping=stopping,
+                         verbose=args.verbose)
+
+    if args.pipeline_depth > 1:
+        exp.run_pipelined(args.trials, depth=args.pipeline_depth)
+    else:
+        exp.run(args.trials)
+    exp.logger.close()
+
+    summary = exp.summary()
+    print(f"✅ {summary['n_steps']} steps, average reward {summary['average_reward']:.3f}, logged to {exp.logger.dir}")
+
+    if args.plot:
+        exp.plot()
+        exp.plot_avg_reward_per_arm_over_time()
+
+
+if __name__ == "__main__":
+    main()
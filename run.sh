@@ -5,4 +5,4 @@ set -e
 python3 -m venv venv 
 source venv/bin/activate
 pip install -r requirements.txt
-python run.py
\ No newline at end of file
+python run.py --live-plot --verbose
\ No newline at end of file
@@ -0,0 +1,97 @@
+import atexit
+import json
+import threading
+import time
+from collections import defaultdict
+
+
+# Record/replay of testbed traffic. Every send_request becomes one JSON line:
+#
+#   {"t": unix time, "request": payload, "status": 200, "response": {...},
+#    "latency": seconds incl. retries, "attempts": 1, "error": null}
+#
+# A recorded session can then be served back without network access, so the
+# agent behaviour of a production run can be re-executed offline.
+
+
+def request_key(request_data):
+    return (
+        request_data["source"],
+        request_data["destination"],
+        tuple(request_data["path"]),
+        request_data["wireless_channel"],
+    )
+
+
+class SessionRecorder:
+
+    def __init__(self, path):
+        """Append every testbed exchange to the JSONL file at `path`."""
+        self.path = path
+        self._file = open(path, "a")
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def record(self, request_data, status, response, latency, attempts, error=None):
+        line = json.dumps({
+            "t": time.time(),
+            "request": request_data,
+            "status": status,
+            "response": response,
+            "latency": latency,
+            "attempts": attempts,
+            "error": error,
+        }, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            # one line per probe and probes take seconds; flushing each keeps
+            # the log complete if the run dies
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        atexit.unregister(self.close)
+
+
+class SessionReplayer:
+
+    def __init__(self, path, strict=False):
+        """
+        Serve recorded responses back in recorded order, per
+        (source, destination, path, channel).
+
+        Args:
+            path: JSONL file written by SessionRecorder.
+            strict: Raise when a link/channel runs out of recorded responses
+                (or was never recorded) instead of starting over from its first one.
+        """
+        self.path = path
+        self.strict = strict
+        self._responses = defaultdict(list)
+        self._cursor = defaultdict(int)
+        self._lock = threading.Lock()
+
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                # failed exchanges replay as failures (send_request returned None)
+                response = entry["response"] if entry["status"] == 200 else None
+                self._responses[request_key(entry["request"])].append(response)
+
+    def next_response(self, request_data):
+        key = request_key(request_data)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise RuntimeError(f"No recorded responses for {key}")
+            k = self._cursor[key]
+            if k >= len(responses):
+                if self.strict:
+                    raise RuntimeError(f"Recorded responses for {key} exhausted after {k} requests")
+                k = 0
+            self._cursor[key] = k + 1
+            return responses[k]
@@ -0,0 +1,239 @@
+import csv
+import json
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from logging_utils import close_at_exit
+
+
+# Columnar binary step log. Every column is a single .npy file that grows
+# chunk by chunk: rows are buffered in preallocated arrays, appended as raw
+# bytes and the fixed-size .npy header is rewritten with the new row count.
+# The result loads with np.load(..., mmap_mode='r'), i.e. zero-copy.
+#
+#   iteration.npy  int64    (n_steps,)
+#   arm_index.npy  int32    (n_steps,)
+#   reward.npy     float64  (n_steps,)
+#   timestamp.npy  float64  (n_steps,)          unix seconds
+#   q_values.npy   float64  (n_steps, n_arms)
+#   meta.json      n_arms and the label of every arm index
+
+COLUMNS = {
+    "iteration": np.int64,
+    "arm_index": np.int32,
+    "reward": np.float64,
+    "timestamp": np.float64,
+}
+
+CSV_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_HEADER_SIZE = 128  # total .npy header size, fixed so it can be rewritten in place
+
+
+def _npy_header(dtype, shape):
+    header = repr({
+        "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        "fortran_order": False,
+        "shape": tuple(shape),
+    })
+    header_len = _HEADER_SIZE - 10
+    header = header.ljust(header_len - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", header_len) + header.encode("latin1")
+
+
+class _NpyColumn:
+
+    def __init__(self, path, dtype, row_shape=()):
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.n_rows = 0
+        self._file = open(path, "wb")
+        self._file.write(_npy_header(self.dtype, (0,) + self.row_shape))
+
+    def append(self, values):
+        self._file.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+        self.n_rows += len(values)
+
+    def sync_header(self):
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, (self.n_rows,) + self.row_shape))
+        self._file.seek(0, 2)
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync_header()
+            self._file.close()
+
+
+class BinaryStepLogger:
+
+    def __init__(self, directory, chunk_size=4096):
+        """
+        Binary counterpart of ExperimentLogger (same log_step signature).
+
+        Args:
+            directory: Directory that receives the column files.
+            chunk_size: Rows buffered in memory before they are appended to disk.
+        """
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+
+        self._columns = {name: _NpyColumn(self.dir / f"{name}.npy", dtype) for name, dtype in COLUMNS.items()}
+        self._buffers = {name: np.empty(chunk_size, dtype=dtype) for name, dtype in COLUMNS.items()}
+        # the number of arms is only known once the first q_values arrive
+        self._q_column = None
+        self._q_buffer = None
+        self._arm_labels = {}
+        self._n_buffered = 0
+        self._closed = False
+
+        close_at_exit(self)
+
+    def log_step(self, iteration, arm_index, arm_label, reward, q_values, timestamp=None):
+        if self._q_column is None:
+            n_arms = len(q_values)
+            self._q_column = _NpyColumn(self.dir / "q_values.npy", np.float64, (n_arms,))
+            self._q_buffer = np.empty((self.chunk_size, n_arms))
+
+        k = self._n_buffered
+        self._buffers["iteration"][k] = iteration
+        self._buffers["arm_index"][k] = arm_index
+        self._buffers["reward"][k] = reward
+        self._buffers["timestamp"][k] = time.time() if timestamp is None else timestamp
+        self._q_buffer[k] = q_values
+        self._arm_labels.setdefault(int(arm_index), arm_label)
+        self._n_buffered += 1
+
+        if self._n_buffered == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._closed:
+            return
+        k = self._n_buffered
+        if k:
+            for name, column in self._columns.items():
+                column.append(self._buffers[name][:k])
+            self._q_column.append(self._q_buffer[:k])
+            self._n_buffered = 0
+
+        for column in self._columns.values():
+            column.sync_header()
+        if self._q_column is not None:
+            self._q_column.sync_header()
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            "n_arms": None if self._q_column is None else self._q_column.row_shape[0],
+            "arm_labels": {str(idx): _jsonable(label) for idx, label in sorted(self._arm_labels.items())},
+        }
+        with open(self.dir / "meta.json", "w") as f:
+            json.dump(meta, f)
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        for column in self._columns.values():
+            column.close()
+        if self._q_column is not None:
+            self._q_column.close()
+        self._closed = True
+
+    def __del__(self):
+        # dropped without close(): write the buffered rows and release the files
+        if getattr(self, "_closed", True) is False:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _jsonable(value):
+    # numpy scalars (e.g. labels taken from an ndarray) are not JSON serializable
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def load_steps(directory, mmap=True):
+    """
+    Load a binary step log. With mmap=True every column is a read-only
+    np.memmap, so nothing is copied until it is actually touched.
+
+    Returns a dict with the columns, 'q_values' and 'arm_labels' (index -> label).
+    """
+    directory = Path(directory)
+    mmap_mode = "r" if mmap else None
+
+    steps = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode) for name in COLUMNS}
+    q_path = directory / "q_values.npy"
+    steps["q_values"] = np.load(q_path, mmap_mode=mmap_mode) if q_path.exists() else np.empty((0, 0))
+
+    with open(directory / "meta.json") as f:
+        meta = json.load(f)
+    steps["arm_labels"] = {int(idx): label for idx, label in meta["arm_labels"].items()}
+    return steps
+
+
+def csv_to_binary(csv_path, directory, chunk_size=4096):
+    """Convert a steps.csv written by ExperimentLogger into a binary step log."""
+    with open(csv_path, newline="") as f, BinaryStepLogger(directory, chunk_size) as logger:
+        for row in csv.DictReader(f):
+            logger.log_step(
+                iteration=int(row["iteration"]),
+                arm_index=int(row["arm_index"]),
+                arm_label=_parse_label(row["arm_label"]),
+                reward=float(row["reward"]),
+                q_values=json.loads(row["q_values"]),
+                timestamp=datetime.strptime(row["timestamp"], CSV_TIMESTAMP_FORMAT).timestamp(),
+            )
+
+
+def binary_to_csv(directory, csv_path, chunk_size=65536):
+    """Convert a binary step log back into the steps.csv format."""
+    steps = load_steps(directory)
+    labels = steps["arm_labels"]
+    n_steps = len(steps["iteration"])
+
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["iteration", "arm_index", "arm_label", "reward", "q_values", "timestamp"])
+        for start in range(0, n_steps, chunk_size):
+            stop = min(start + chunk_size, n_steps)
+            arm_index = steps["arm_index"][start:stop]
+            writer.writerows(
+                [
+                    int(it),
+                    int(arm),
+                    labels.get(int(arm), ""),
+                    float(reward),
+                    json.dumps(q.tolist()),
+                    datetime.fromtimestamp(ts).strftime(CSV_TIMESTAMP_FORMAT),
+                ]
+                for it, arm, reward, q, ts in zip(
+                    steps["iteration"][start:stop],
+                    arm_index,
+                    steps["reward"][start:stop],
+                    steps["q_values"][start:stop],
+                    steps["timestamp"][start:stop],
+                )
+            )
+
+
+def _parse_label(text):
+    # arm labels are channel numbers or device ids; keep them numeric when possible
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
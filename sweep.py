@@ -0,0 +1,207 @@
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+
+# Parameter sweep: every combination of epsilon, alpha, update_rule,
+# reward_machine, arm set and seed is one headless Experiment. Runs are fanned
+# out over a process pool (all cores by default); each one logs into its own
+# subdirectory of experiments/sweep_<timestamp>/. At the end the results of
+# all runs (results.csv) and the mean / 95% CI of the final average reward
+# per configuration (summary.csv) are written next to them.
+#
+#   python sweep.py --epsilon 0.1,0.25 --alpha 0.1,0.5 --reward-machine 1,2 \
+#       --arms "2,3,4,11" --seeds 0-9 --trials 500
+
+
+def expand_grid(epsilons, alphas, update_rules, reward_machines, arm_sets, seeds):
+    """
+    All run configurations of the grid. alpha only matters for
+    exponential_smoothing, so incremental runs are not repeated per alpha.
+    """
+    configs = []
+    for update_rule in update_rules:
+        rule_alphas = alphas if update_rule == "exponential_smoothing" else [None]
+        for epsilon, alpha, machine, arms, seed in itertools.product(
+                epsilons, rule_alphas, reward_machines, arm_sets, seeds):
+            configs.append({
+                "epsilon": epsilon,
+                "alpha": alpha,
+                "update_rule": update_rule,
+                "reward_machine": machine,
+                "arms": list(arms),
+                "seed": seed,
+            })
+    return configs
+
+
+def run_one(index, config, n_trials, exptype, sweep_dir, endpoint, source_ip, dest_ip, channel, reward_trace):
+    """Worker: one headless experiment in its own subdirectory."""
+    from agents import EpsilonGreedy
+    from environments import WirelessChannelEnv, WirelessRouteEnv
+    from experiment import Experiment
+    from ExperimentLogger import ExperimentLogger
+
+    # agent and simulated environments draw from numpy's global generator
+    np.random.seed(config["seed"])
+
+    arms = config["arms"]
+    agent = EpsilonGreedy(
+        n_arms=len(arms),
+        epsilon=config["epsilon"],
+        update_rule=config["update_rule"],
+        alpha=config["alpha"],
+    )
+    if exptype == "optimal_route":
+        env = WirelessRouteEnv(source_ip, dest_ip, arms, endpoint, config["reward_machine"], channel,
+                               reward_trace=reward_trace)
+    else:
+        env = WirelessChannelEnv(source_ip, dest_ip, arms, endpoint, config["reward_machine"],
+                                 reward_trace=reward_trace)
+
+    name = f"run_{index:05d}"
+    logger = ExperimentLogger(name, base_dir=sweep_dir)
+    exp = Experiment(agent, env, exptype, logger=logger)
+
+    start = time.perf_counter()
+    exp.run(n_trials)
+    elapsed = time.perf_counter() - start
+    logger.close()
+
+    summary = exp.summary()
+    counts = np.array([arm["count"] for arm in summary["arms"]])
+    return {
+        "run": name,
+        **{key: config[key] for key in ("epsilon", "alpha", "update_rule", "reward_machine", "seed")},
+        "arms": " ".join(str(a) for a in arms),
+        "n_trials": n_trials,
+        "final_avg_reward": summary["average_reward"],
+        "best_arm": arms[int(np.argmax(agent.get_estimated_values()))],
+        "most_pulled_arm": arms[int(np.argmax(counts))],
+        "seconds": elapsed,
+    }
+
+
+def aggregate(results):
+    """Mean and 95% CI (normal approximation) of the final average reward per configuration."""
+    keys = ("epsilon", "alpha", "update_rule", "reward_machine", "arms")
+    groups = {}
+    for r in results:
+        groups.setdefault(tuple(r[k] for k in keys), []).append(r["final_avg_reward"])
+
+    rows = []
+    for group_key, values in sorted(groups.items(), key=lambda item: str(item[0])):
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        mean = values.mean()
+        half_width = 1.96 * values.std(ddof=1) / np.sqrt(n) if n > 1 else float("nan")
+        rows.append({
+            **dict(zip(keys, group_key)),
+            "n_seeds": n,
+            "mean_final_reward": mean,
+            "ci95_low": mean - half_width,
+            "ci95_high": mean + half_width,
+        })
+    rows.sort(key=lambda row: row["mean_final_reward"], reverse=True)
+    return rows
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_sweep(configs, n_trials, exptype="optimal_channel", sweep_dir=None, workers=None,
+              endpoint="http://localhost:8000/network/data-transfer-rate",
+              source_ip="192.168.2.80", dest_ip="192.168.2.100", channel=165, reward_trace=None):
+    """
+    Run every config on a process pool and write results.csv / summary.csv.
+    Returns (results, summary).
+    """
+    if sweep_dir is None:
+        sweep_dir = Path("experiments") / f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    sweep_dir = Path(sweep_dir)
+    sweep_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [
+            pool.submit(run_one, index, config, n_trials, exptype, sweep_dir, endpoint, source_ip, dest_ip, channel,
+                        reward_trace)
+            for index, config in enumerate(configs)
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            results.append(future.result())
+            print(f"\r{done}/{len(futures)} runs finished", end="", flush=True)
+    print()
+
+    results.sort(key=lambda r: r["run"])
+    summary = aggregate(results)
+    _write_csv(sweep_dir / "results.csv", results)
+    _write_csv(sweep_dir / "summary.csv", summary)
+    return results, summary
+
+
+def _float_list(text):
+    return [float(x) for x in text.split(",") if x]
+
+
+def _seeds(text):
+    # "0-9" or "1,5,7"
+    if "-" in text:
+        first, last = text.split("-")
+        return list(range(int(first), int(last) + 1))
+    return [int(x) for x in text.split(",") if x]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a grid of experiments on a process pool.")
+    parser.add_argument("--epsilon", type=_float_list, default=[0.1, 0.25])
+    parser.add_argument("--alpha", type=_float_list, default=[0.1, 0.5])
+    parser.add_argument("--update-rule", default="incremental,exponential_smoothing",
+                        help="comma separated update rules")
+    parser.add_argument("--reward-machine", default="1,2", help="comma separated reward machines")
+    parser.add_argument("--arms", nargs="+", default=["2,3,4,11"],
+                        help="one or more arm sets, each a comma separated list of channels/devices")
+    parser.add_argument("--seeds", type=_seeds, default=list(range(10)), help="e.g. 0-9 or 1,2,3")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--exptype", default="optimal_channel", choices=["optimal_channel", "optimal_route"])
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--out", default=None, help="sweep directory (default: experiments/sweep_<timestamp>)")
+    parser.add_argument("--endpoint", default="http://localhost:8000/network/data-transfer-rate")
+    parser.add_argument("--trace", default=None, help="trace file for reward_machine 3 (see traces.py)")
+    args = parser.parse_args()
+
+    configs = expand_grid(
+        epsilons=args.epsilon,
+        alphas=args.alpha,
+        update_rules=args.update_rule.split(","),
+        reward_machines=[int(m) for m in args.reward_machine.split(",")],
+        arm_sets=[[int(a) for a in arms.split(",")] for arms in args.arms],
+        seeds=args.seeds,
+    )
+    print(f"{len(configs)} runs x {args.trials} trials")
+
+    _, summary = run_sweep(configs, args.trials, exptype=args.exptype, sweep_dir=args.out,
+                           workers=args.workers, endpoint=args.endpoint, reward_trace=args.trace)
+
+    print(f"{'epsilon':>8s} {'alpha':>6s} {'update_rule':>22s} {'rm':>3s} {'arms':>12s} "
+          f"{'mean':>8s} {'95% CI':>18s}")
+    for row in summary:
+        alpha = "-" if row["alpha"] is None else f"{row['alpha']:.2f}"
+        print(f"{row['epsilon']:8.2f} {alpha:>6s} {row['update_rule']:>22s} {row['reward_machine']:3d} "
+              f"{row['arms']:>12s} {row['mean_final_reward']:8.3f} "
+              f"[{row['ci95_low']:7.3f}, {row['ci95_high']:7.3f}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+
+
+# Per-step phase timings of Experiment.run. "reward" is the whole get_reward
+# call; for testbed rewards it is split further into the rate-limiter wait,
+# the HTTP round trips and the retry backoff sleeps.
+PHASES = (
+    "select",
+    "reward",
+    "reward_wait",
+    "reward_http",
+    "reward_retry",
+    "update",
+    "log",
+    "plot",
+    "total",
+)
+
+clock = time.perf_counter
+
+
+class StepTimings:
+
+    def __init__(self, capacity=1024):
+        """
+        Preallocated (capacity, phases) buffer of durations in seconds.
+        It doubles when full, so the capacity only needs to be a good guess.
+        """
+        self.data = np.zeros((capacity, len(PHASES)))
+        self.iterations = np.zeros(capacity, dtype=np.int64)
+        self.attempts = np.zeros(capacity, dtype=np.int32)
+        self.n = 0
+        self._index = {phase: k for k, phase in enumerate(PHASES)}
+
+    def reserve(self, extra):
+        """Make room for `extra` more steps up front."""
+        needed = self.n + extra
+        if needed > len(self.data):
+            self._grow(needed)
+
+    def _grow(self, capacity):
+        capacity = max(capacity, 2 * len(self.data))
+        data = np.zeros((capacity, len(PHASES)))
+        data[:self.n] = self.data[:self.n]
+        iterations = np.zeros(capacity, dtype=np.int64)
+        iterations[:self.n] = self.iterations[:self.n]
+        attempts = np.zeros(capacity, dtype=np.int32)
+        attempts[:self.n] = self.attempts[:self.n]
+        self.data, self.iterations, self.attempts = data, iterations, attempts
+
+    def start_step(self, iteration):
+        """Open a new row and return its index."""
+        if self.n == len(self.data):
+            self._grow(self.n + 1)
+        row = self.n
+        self.iterations[row] = iteration
+        self.n += 1
+        return row
+
+    def add(self, row, phase, seconds):
+        self.data[row, self._index[phase]] += seconds
+
+    def add_request(self, row, request_timing):
+        """Book the wait/http/retry split reported by the environment (None for simulated rewards)."""
+        if request_timing is None:
+            return
+        self.add(row, "reward_wait", request_timing["wait"])
+        self.add(row, "reward_http", request_timing["http"])
+        self.add(row, "reward_retry", request_timing["retry"])
+        self.attempts[row] = request_timing["attempts"]
+
+    def save(self, path):
+        """Write one line per step: iteration, attempts and every phase in seconds."""
+        table = np.column_stack([self.iterations[:self.n], self.attempts[:self.n], self.data[:self.n]])
+        fmt = ["%d", "%d"] + ["%.9f"] * len(PHASES)
+        np.savetxt(path, table, delimiter=",", fmt=fmt,
+                   header=",".join(("iteration", "attempts") + PHASES), comments="")
+
+    def summary(self):
+        """p50/p95/p99, mean and total of every phase, in seconds."""
+        data = self.data[:self.n]
+        if self.n == 0:
+            return {}
+        p50, p95, p99 = np.percentile(data, [50, 95, 99], axis=0)
+        return {
+            phase: {
+                "p50": float(p50[k]),
+                "p95": float(p95[k]),
+                "p99": float(p99[k]),
+                "mean": float(data[:, k].mean()),
+                "total": float(data[:, k].sum()),
+            }
+            for k, phase in enumerate(PHASES)
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"\n⏱  Step timings over {self.n} steps (ms)")
+        print(f"{'phase':14s} {'p50':>10s} {'p95':>10s} {'p99':>10s} {'total s':>10s}")
+        for phase, stats in summary.items():
+            print(f"{phase:14s} {stats['p50'] * 1e3:10.3f} {stats['p95'] * 1e3:10.3f} "
+                  f"{stats['p99'] * 1e3:10.3f} {stats['total']:10.3f}")
@@ -0,0 +1,109 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+
+# Trace-driven rewards (reward_machine 3). A trace holds measured throughputs
+# per arm:
+#
+#   <name>.npy   float64 (n_arms, max_samples), row = arm, NaN padded
+#   <name>.json  {"labels": [...], "counts": [...]}  arm label of each row
+#                and how many samples it really has
+#
+# The matrix is memory-mapped, so a draw is one O(1) lookup at
+# [row of the arm, cursor of the arm] and only touched pages are read.
+
+
+def _meta_path(path):
+    return Path(path).with_suffix(".json")
+
+
+def build_trace(path, samples_by_arm):
+    """
+    Write a trace file.
+
+    Args:
+        path: Target .npy path (the .json sidecar goes next to it).
+        samples_by_arm: {arm label: sequence of throughputs}, labels being the
+            channels or devices the environment passes to get_reward.
+    """
+    path = Path(path).with_suffix(".npy")
+    labels = list(samples_by_arm)
+    counts = [len(samples_by_arm[label]) for label in labels]
+
+    trace = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(len(labels), max(counts, default=0)))
+    trace[:] = np.nan
+    for row, label in enumerate(labels):
+        trace[row, :counts[row]] = np.asarray(samples_by_arm[label], dtype=np.float64)
+    trace.flush()
+    del trace
+
+    with open(_meta_path(path), "w") as f:
+        json.dump({"labels": [str(label) for label in labels], "counts": counts}, f)
+    return path
+
+
+def trace_from_steps(exp_dir, path, chunksize=100_000):
+    """
+    Build a trace from a recorded experiment (its steps.csv or steps_bin/):
+    the rewards measured for every arm, in the order they were measured.
+    """
+    from replay import iter_step_chunks
+
+    samples = {}
+    for chunk in iter_step_chunks(exp_dir, chunksize):
+        for label in np.unique(chunk["arm_label"].astype(str)):
+            mask = chunk["arm_label"].astype(str) == label
+            samples.setdefault(label, []).append(chunk["reward"][mask])
+    return build_trace(path, {label: np.concatenate(parts) for label, parts in samples.items()})
+
+
+class TraceRewards:
+
+    def __init__(self, path, wrap=True):
+        """
+        Replays a trace file arm by arm.
+
+        Args:
+            path: The .npy trace written by build_trace.
+            wrap: Start an arm's samples over when they run out; if False,
+                running out raises RuntimeError.
+        """
+        path = Path(path).with_suffix(".npy")
+        self.values = np.load(path, mmap_mode="r")
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+
+        self.labels = meta["labels"]
+        self.counts = np.asarray(meta["counts"], dtype=np.int64)
+        self.wrap = wrap
+        self._rows = {label: row for row, label in enumerate(self.labels)}
+        self._cursor = np.zeros(len(self.labels), dtype=np.int64)
+
+    def draw(self, arm_label):
+        """Next recorded throughput of the given channel/device."""
+        try:
+            row = self._rows[str(arm_label)]
+        except KeyError:
+            raise RuntimeError(f"No rewards for arm {arm_label} in trace") from None
+
+        k = self._cursor[row]
+        if k >= self.counts[row]:
+            if not self.wrap or self.counts[row] == 0:
+                raise RuntimeError(f"No more rewards available in trace for arm {arm_label}")
+            k = 0
+        self._cursor[row] = k + 1
+        return float(self.values[row, k])
+
+    @property
+    def position(self):
+        """Next sample index of every arm (trace row order), e.g. to checkpoint the replay."""
+        return self._cursor.copy()
+
+    @position.setter
+    def position(self, position):
+        self._cursor[:] = position
+
+    def rewind(self):
+        self._cursor[:] = 0